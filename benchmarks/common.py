@@ -0,0 +1,176 @@
+"""Shared helpers for the benchmark scripts.
+
+The scripts are run from the repository root, e.g.
+``python benchmarks/feed_indexes.py --posts 1000000``. They work on a
+separate SQLite database (``benchmarks/bench.sqlite3`` by default) so the
+development database is never touched.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BENCH_DB = Path(__file__).resolve().parent / "bench.sqlite3"
+BATCH_SIZE = 10000
+
+
+def setup_django(db_path=BENCH_DB):
+    sys.path.insert(0, str(ROOT_DIR / "blogicum"))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blogicum.settings")
+    from django.conf import settings
+
+    settings.DATABASES["default"]["NAME"] = str(db_path)
+    settings.DEBUG = False
+    import django
+
+    django.setup()
+
+
+def base_parser(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--db", type=Path, default=BENCH_DB)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--locations", type=int, default=50)
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--comments", type=int, default=0)
+    parser.add_argument(
+        "--reseed", action="store_true",
+        help="Drop the benchmark database and seed it again.",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    return parser
+
+
+def prepare_database(options, migrate_to=None, post_text=None):
+    """Migrate the benchmark database and seed it unless already seeded.
+
+    Seeding always runs at the latest migration, since it builds rows from
+    the current models; ``migrate_to`` then takes the blog app back to an
+    older schema. ``post_text(rnd, number)`` can replace the repetitive
+    default text of the seeded posts.
+    """
+    if options.reseed and options.db.exists():
+        options.db.unlink()
+    setup_django(options.db)
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+    from blog.models import Post
+
+    if not Post.objects.exists():
+        seed(options, post_text)
+    if migrate_to:
+        call_command("migrate", "blog", migrate_to, verbosity=0)
+
+
+def default_post_text(rnd, number):
+    return f"Текст публикации номер {number}. " * rnd.randint(5, 50)
+
+
+def seed(options, post_text=None):
+    from django.contrib.auth import get_user_model
+    from django.db import transaction
+    from django.utils import timezone
+    from mixer.backend.django import mixer
+
+    from blog.models import Category, Comment, Location, Post
+
+    User = get_user_model()
+    rnd = random.Random(options.seed)
+    now = timezone.now()
+    started = time.perf_counter()
+    with transaction.atomic():
+        # Small tables are built the way tests/fixtures build them.
+        mixer.cycle(options.users).blend(User)
+        mixer.cycle(options.categories).blend(
+            "blog.Category", is_published=mixer.sequence(lambda i: i != 0)
+        )
+        mixer.cycle(options.locations).blend(
+            "blog.Location",
+            is_published=mixer.sequence(lambda i: i % 10 != 0),
+        )
+    user_ids = list(User.objects.values_list("id", flat=True))
+    category_ids = list(Category.objects.values_list("id", flat=True))
+    location_ids = list(Location.objects.values_list("id", flat=True))
+    post_text = post_text or default_post_text
+
+    def posts():
+        for i in range(options.posts):
+            text = post_text(rnd, i)
+            minutes_ago = rnd.randint(-10000, 2500000)
+            yield Post(
+                title=f"Публикация {i}",
+                text=text,
+                excerpt=Post.make_excerpt(text),
+                pub_date=now - timedelta(minutes=minutes_ago),
+                author_id=rnd.choice(user_ids),
+                category_id=rnd.choice(category_ids),
+                location_id=rnd.choice(location_ids),
+                is_published=rnd.random() > 0.05,
+            )
+
+    bulk_insert(Post, posts())
+    if options.comments:
+        post_ids = Post.objects.values_list("id", flat=True)
+        last_post_id = post_ids.order_by("-id").first()
+        first_post_id = post_ids.order_by("id").first()
+
+        def comments():
+            for i in range(options.comments):
+                yield Comment(
+                    text=f"Комментарий {i}",
+                    post_id=rnd.randint(first_post_id, last_post_id),
+                    author_id=rnd.choice(user_ids),
+                )
+
+        bulk_insert(Comment, comments())
+        Post.objects.recount_comments()
+    print(
+        f"Seeded {options.posts} posts and {options.comments} comments "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+
+def bulk_insert(model, objects):
+    from django.db import transaction
+
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) == BATCH_SIZE:
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+
+
+def measure(func, repeat):
+    """Call ``func`` ``repeat`` times and return timings in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def percentile(timings, pct):
+    ordered = sorted(timings)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summary(timings):
+    return {
+        "p50": percentile(timings, 50),
+        "p95": percentile(timings, 95),
+        "p99": percentile(timings, 99),
+        "mean": statistics.fmean(timings),
+    }
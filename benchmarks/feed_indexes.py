@@ -0,0 +1,77 @@
+"""EXPLAIN plans and latency of the feed queries before/after 0006.
+
+    python benchmarks/feed_indexes.py --posts 1000000 --reseed
+
+The database is seeded, migrated back to 0005 (no feed indexes),
+measured, migrated forward and measured again. The queries select only
+columns that exist at 0005, so both runs read the same rows.
+"""
+from common import base_parser, measure, prepare_database, summary
+
+BEFORE = "0005_post_comment_count"
+REPEAT = 50
+# Columns of the feed cards that already exist at BEFORE.
+FEED_COLUMNS = (
+    "id",
+    "title",
+    "text",
+    "pub_date",
+    "image",
+    "is_published",
+    "comment_count",
+    "author__username",
+    "category__slug",
+    "category__title",
+    "category__is_published",
+    "location__name",
+    "location__is_published",
+)
+
+
+def feed_queries():
+    from django.contrib.auth import get_user_model
+
+    from blog.managers import FEED_RELATED
+    from blog.models import Category, Post
+    from blogicum.constants import POSTS_PER_PAGE
+
+    author = get_user_model().objects.order_by("id").first()
+    category = Category.objects.filter(is_published=True).first()
+    feed = (
+        Post.objects.published()
+        .select_related(*FEED_RELATED)
+        .only(*FEED_COLUMNS)
+        .order_by("-pub_date")
+    )
+    return {
+        "index": feed[:POSTS_PER_PAGE],
+        "category": feed.filter(category=category)[:POSTS_PER_PAGE],
+        "profile": feed.filter(author=author)[:POSTS_PER_PAGE],
+    }
+
+
+def report(stage):
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    print(f"\n=== {stage} ===")
+    for name, queryset in feed_queries().items():
+        timings = measure(lambda: list(queryset.all()), REPEAT)
+        stats = summary(timings)
+        print(f"\n[{name}] p50={stats['p50']:.2f}ms p95={stats['p95']:.2f}ms")
+        print(queryset.explain())
+
+
+def main():
+    options = base_parser(__doc__).parse_args()
+    prepare_database(options, migrate_to=BEFORE)
+    from django.core.management import call_command
+
+    report("without feed indexes")
+    call_command("migrate", "blog", verbosity=0)
+    report("with feed indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Write throughput of post creation under concurrent load.
+
+    python benchmarks/post_create.py --requests 500 --concurrency 8
+
+Every worker thread logs in as its own author and submits the create-post
+form through the full middleware stack. Failed requests (e.g. SQLite
+reporting a locked database) are counted, not retried. Created posts are
+deleted afterwards so repeated runs start from the same data.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import base_parser, percentile, prepare_database
+from views import HOST, query_count
+
+
+def authors(count):
+    from django.contrib.auth import get_user_model
+
+    return list(get_user_model().objects.order_by("id")[:count])
+
+
+def form_data():
+    from blog.models import Category, Location
+
+    return {
+        "title": "Нагрузочная публикация",
+        "text": "Текст нагрузочной публикации. " * 20,
+        "pub_date": "2020-01-01T00:00",
+        "category": Category.objects.filter(is_published=True).first().id,
+        "location": Location.objects.filter(is_published=True).first().id,
+    }
+
+
+def benchmark(options):
+    from django.db import connection
+    from django.test import Client
+
+    from blog.models import Post
+
+    users = authors(options.concurrency)
+    data = form_data()
+    local = threading.local()
+    last_id = Post.objects.order_by("-id").values_list("id", flat=True)[0]
+
+    def create(number):
+        if not hasattr(local, "client"):
+            local.client = Client(HTTP_HOST=HOST)
+            local.client.force_login(users[number % len(users)])
+        started = time.perf_counter()
+        response = local.client.post(
+            "/posts/create/", {**data, "title": f"{data['title']} {number}"}
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        connection.close()
+        return (
+            elapsed, response.status_code == 302,
+            query_count(response.get("Server-Timing")),
+        )
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(options.concurrency) as pool:
+        results = list(pool.map(create, range(options.requests)))
+    wall = time.perf_counter() - started
+    Post.objects.filter(id__gt=last_id).delete()
+
+    timings = [elapsed for elapsed, ok, _ in results if ok]
+    return {
+        "p50": round(percentile(timings, 50), 2),
+        "p95": round(percentile(timings, 95), 2),
+        "p99": round(percentile(timings, 99), 2),
+        "rps": round(len(timings) / wall, 1),
+        "errors": sum(not ok for _, ok, _ in results),
+        "queries": results[-1][2],
+    }
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    options = parser.parse_args()
+    prepare_database(options)
+    logging.disable(logging.WARNING)
+
+    result = benchmark(options)
+    for name, value in result.items():
+        print(f"{name:<8}{value:>10}")
+
+
+if __name__ == "__main__":
+    main()
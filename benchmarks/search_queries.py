@@ -0,0 +1,101 @@
+"""Latency of full-text search queries.
+
+    python benchmarks/search_queries.py --reseed
+    python benchmarks/search_queries.py --backend python --posts 100000
+
+Posts are seeded with text drawn from a synthetic vocabulary with a
+Zipf-like word distribution, so queries range from words found in most
+posts to words found in a handful. The index of the chosen backend is
+rebuilt when it is empty. Each query is timed the way the search page runs
+it: the number of matches plus the first page of posts.
+"""
+import itertools
+import time
+from pathlib import Path
+
+from common import base_parser, measure, prepare_database, summary
+
+SEARCH_DB = Path(__file__).resolve().parent / "search.sqlite3"
+SYLLABLES = (
+    "ба", "ве", "го", "ду", "жи", "за", "ки", "ло", "ма", "не", "по", "ру",
+    "са", "ти", "ху", "ча", "ше", "ю", "я", "ор",
+)
+VOCABULARY = [
+    "".join(parts)
+    for parts in itertools.islice(
+        itertools.product(SYLLABLES, repeat=3), 5000
+    )
+]
+# Zipf: the word of rank r is chosen with weight 1 / r.
+CUMULATIVE_WEIGHTS = list(
+    itertools.accumulate(1 / rank for rank in range(1, len(VOCABULARY) + 1))
+)
+QUERIES = {
+    "common word": VOCABULARY[0],
+    "mid word": VOCABULARY[100],
+    "rare word": VOCABULARY[4000],
+    "common pair": f"{VOCABULARY[0]} {VOCABULARY[1]}",
+    "mixed pair": f"{VOCABULARY[0]} {VOCABULARY[2000]}",
+    "no match": "несуществующее",
+}
+REPEAT = 20
+
+
+def post_text(rnd, number):
+    words = rnd.choices(
+        VOCABULARY, cum_weights=CUMULATIVE_WEIGHTS, k=rnd.randint(20, 120)
+    )
+    return " ".join(words).capitalize() + "."
+
+
+def index_is_empty():
+    from blog.models import Post
+    from search.backends import SearchResults
+
+    post = Post.objects.order_by("id").only("title").first()
+    return not SearchResults(post.title, Post.objects.all()).count()
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.set_defaults(db=SEARCH_DB, posts=1000000)
+    parser.add_argument(
+        "--backend", choices=("auto", "fts5", "python"), default="auto"
+    )
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    options = parser.parse_args()
+    prepare_database(options, post_text=post_text)
+
+    from django.conf import settings
+
+    settings.SEARCH_BACKEND = options.backend
+    from blog.models import Post
+    from blogicum.constants import POSTS_PER_PAGE
+    from search.backends import SearchResults, get_backend, rebuild
+
+    print(f"Backend: {type(get_backend()).__name__}")
+    if index_is_empty():
+        started = time.perf_counter()
+        rebuild(options.batch_size)
+        print(f"Indexed in {time.perf_counter() - started:.1f}s")
+
+    def run(query):
+        results = SearchResults(query, Post.published_posts_comments.all())
+        return results.count(), results[:POSTS_PER_PAGE]
+
+    print(
+        f"\n{'query':<14}{'matches':>10}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'mean ms':>10}"
+    )
+    for name, query in QUERIES.items():
+        matches = run(query)[0]
+        stats = summary(measure(lambda: run(query), options.repeat))
+        print(
+            f"{name:<14}{matches:>10}{stats['p50']:>10.1f}"
+            f"{stats['p95']:>10.1f}{stats['mean']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
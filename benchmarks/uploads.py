@@ -0,0 +1,157 @@
+"""Worker memory under hostile image uploads.
+
+    python benchmarks/uploads.py
+    python benchmarks/uploads.py --no-limits
+
+Each scenario runs in a fresh interpreter: it posts one image to the
+create-post form and then drains the image job queue, like a web worker
+followed by ``process_images``. The peak RSS of that interpreter is
+reported next to an ordinary photo, so with IMAGE_UPLOAD_LIMITS in place
+every column should stay close to the baseline row. ``--no-limits`` lifts
+the limits to show what the same uploads cost without them. The test
+client builds the request body in the same process, so the huge-file row
+includes the size of the request itself either way.
+"""
+import json
+import logging
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+
+from common import base_parser, prepare_database
+
+SCENARIOS = ("photo", "huge-file", "pixel-bomb", "panorama")
+NO_LIMITS = {
+    "MAX_BYTES": 10 ** 12,
+    "MAX_PIXELS": 10 ** 12,
+    "MAX_SIDE": 10 ** 6,
+}
+
+
+def make_upload(name, directory):
+    """Write the payload of a scenario and return its path."""
+    from PIL import Image
+
+    path = Path(directory) / f"{name}.bin"
+    buffer = BytesIO()
+    if name == "photo":
+        Image.effect_noise((1600, 1200), 64).convert("RGB").save(
+            buffer, "JPEG", quality=90
+        )
+    elif name == "huge-file":
+        Image.new("RGB", (100, 100)).save(buffer, "JPEG")
+        buffer.write(b"\0" * 64 * 1024 * 1024)
+    elif name == "pixel-bomb":
+        # A valid 9000x9000 PNG that compresses to almost nothing.
+        Image.new("L", (9000, 9000)).save(buffer, "PNG", optimize=True)
+    else:
+        Image.new("L", (40000, 1500)).save(buffer, "PNG", optimize=True)
+    path.write_bytes(buffer.getvalue())
+    return path
+
+
+def run_scenario(options):
+    """Child process: upload the payload and process the queue."""
+    from django.conf import settings
+
+    if options.no_limits:
+        settings.IMAGE_UPLOAD_LIMITS = NO_LIMITS
+    settings.MEDIA_ROOT = options.media
+    from django.contrib.auth import get_user_model
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.test import Client
+
+    from blog.jobs import drain
+    from blog.models import Category, Location
+    from views import HOST
+
+    client = Client(HTTP_HOST=HOST)
+    client.force_login(get_user_model().objects.first())
+    started = time.perf_counter()
+    response = client.post("/posts/create/", {
+        "title": f"Загрузка {time.time_ns()}",
+        "text": "Текст",
+        "pub_date": "2020-01-01T00:00",
+        "category": Category.objects.filter(is_published=True).first().id,
+        "location": Location.objects.filter(is_published=True).first().id,
+        "image": SimpleUploadedFile(
+            "upload.png", Path(options.payload).read_bytes()
+        ),
+    })
+    upload_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    try:
+        jobs = drain()
+    except MemoryError:
+        jobs = -1
+    print(json.dumps({
+        "accepted": response.status_code == 302,
+        "upload_ms": round(upload_ms, 1),
+        "jobs": jobs,
+        "process_ms": round((time.perf_counter() - started) * 1000, 1),
+        "peak_rss_mb": peak_rss_mb(),
+    }))
+
+
+def peak_rss_mb():
+    """High-water RSS of this process.
+
+    ru_maxrss can carry the parent's peak over exec, so VmHWM is preferred
+    where /proc is available.
+    """
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--no-limits", action="store_true")
+    parser.add_argument("--scenario", choices=SCENARIOS, help="internal")
+    parser.add_argument("--payload", help="internal")
+    parser.add_argument("--media", help="internal")
+    options = parser.parse_args()
+    prepare_database(options)
+    logging.disable(logging.WARNING)
+    if options.scenario:
+        return run_scenario(options)
+
+    print(
+        f"{'scenario':<17}{'size':>9}{'accepted':>10}{'upload ms':>11}"
+        f"{'process ms':>12}{'peak RSS MB':>13}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for name in SCENARIOS:
+            payload = make_upload(name, directory)
+            command = [
+                sys.executable, __file__, "--db", str(options.db),
+                "--scenario", name, "--payload", str(payload),
+                "--media", directory,
+            ]
+            if options.no_limits:
+                command.append("--no-limits")
+            output = subprocess.run(
+                command, capture_output=True, text=True
+            )
+            lines = output.stdout.strip().splitlines()
+            if output.returncode or not lines:
+                print(f"{name:<17} failed: {output.stderr.strip()[-200:]}")
+                continue
+            result = json.loads(lines[-1])
+            size = f"{payload.stat().st_size / 1024:.0f}K"
+            print(
+                f"{name:<17}{size:>9}{str(result['accepted']):>10}"
+                f"{result['upload_ms']:>11}{result['process_ms']:>12}"
+                f"{result['peak_rss_mb']:>13}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Latency, throughput and query counts of the blog views.
+
+    python benchmarks/views.py --posts 100000 --comments 300000
+    python benchmarks/views.py --runner wsgi --concurrency 8
+    python benchmarks/views.py --save-baseline
+    python benchmarks/views.py --compare
+
+Requests go through the full middleware stack; query counts are read from
+the Server-Timing header written by RequestMetricsMiddleware. ``--compare``
+exits with status 1 when a scenario is slower than its stored baseline by
+more than ``--tolerance`` or issues more queries. The stored baselines
+were recorded with the default volumes.
+"""
+import asyncio
+import http.client
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from common import base_parser, percentile, prepare_database
+
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+HOST = "127.0.0.1"
+QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+def scenarios():
+    from django.contrib.auth import get_user_model
+
+    from blog.models import Category, Post
+
+    post = Post.published_posts.order_by("-comment_count").first()
+    category = Category.objects.filter(is_published=True).first()
+    author = get_user_model().objects.get(pk=post.author_id)
+    urls = {
+        "index": "/",
+        "index-deep": "/?page=50",
+        "category": f"/category/{category.slug}/",
+        "profile": f"/profile/{author.username}/",
+        "detail": f"/posts/{post.id}/",
+    }
+    return author, [
+        (f"{name}:{viewer}", url, viewer == "auth")
+        for name, url in urls.items()
+        for viewer in ("anon", "auth")
+    ]
+
+
+def session_cookie(user):
+    from django.conf import settings
+    from django.test import Client
+
+    client = Client()
+    client.force_login(user)
+    name = settings.SESSION_COOKIE_NAME
+    return f"{name}={client.cookies[name].value}"
+
+
+def query_count(server_timing):
+    match = QUERIES_RE.search(server_timing or "")
+    return int(match.group(1)) if match else None
+
+
+def run_client(url, cookie, requests, concurrency):
+    from django.test import Client
+
+    client = Client(HTTP_HOST=HOST, HTTP_COOKIE=cookie or "")
+    timings, queries = [], None
+    started = time.perf_counter()
+    for _ in range(requests):
+        request_started = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - request_started) * 1000)
+        queries = query_count(response.get("Server-Timing"))
+    return timings, time.perf_counter() - started, queries
+
+
+class ThreadingServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def start_wsgi_server():
+    from django.core.wsgi import get_wsgi_application
+
+    server = make_server(
+        HOST, 0, get_wsgi_application(),
+        server_class=ThreadingServer, handler_class=QuietHandler,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_wsgi(url, cookie, requests, concurrency, server):
+    headers = {"Cookie": cookie} if cookie else {}
+
+    def fetch(_):
+        connection = http.client.HTTPConnection(HOST, server.server_port)
+        request_started = time.perf_counter()
+        connection.request("GET", url, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        connection.close()
+        elapsed = (time.perf_counter() - request_started) * 1000
+        return elapsed, query_count(response.getheader("Server-Timing"))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(fetch, range(requests)))
+    return (
+        [elapsed for elapsed, _ in results],
+        time.perf_counter() - started,
+        results[-1][1],
+    )
+
+
+def run_asgi(url, cookie, requests, concurrency):
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+    path, _, query = url.partition("?")
+    headers = [(b"host", HOST.encode())]
+    if cookie:
+        headers.append((b"cookie", cookie.encode()))
+
+    async def fetch(semaphore):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"},
+            "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": path, "raw_path": path.encode(),
+            "query_string": query.encode(), "headers": headers,
+            "client": (HOST, 0), "server": (HOST, 80),
+        }
+        response_headers = {}
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response_headers.update(
+                    (name.decode().lower(), value.decode())
+                    for name, value in message["headers"]
+                )
+
+        async with semaphore:
+            request_started = time.perf_counter()
+            await application(scope, receive, send)
+            elapsed = (time.perf_counter() - request_started) * 1000
+        return elapsed, query_count(response_headers.get("server-timing"))
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(
+            *(fetch(semaphore) for _ in range(requests))
+        )
+
+    started = time.perf_counter()
+    results = asyncio.run(main())
+    return (
+        [elapsed for elapsed, _ in results],
+        time.perf_counter() - started,
+        results[-1][1],
+    )
+
+
+def benchmark(options):
+    author, cases = scenarios()
+    cookie = session_cookie(author)
+    extra = {}
+    if options.runner == "wsgi":
+        runner = run_wsgi
+        extra["server"] = start_wsgi_server()
+    elif options.runner == "asgi":
+        runner = run_asgi
+    else:
+        runner = run_client
+    results = {}
+    for name, url, authenticated in cases:
+        timings, wall, queries = runner(
+            url, cookie if authenticated else None,
+            options.requests, options.concurrency, **extra,
+        )
+        results[name] = {
+            "p50": round(percentile(timings, 50), 2),
+            "p95": round(percentile(timings, 95), 2),
+            "p99": round(percentile(timings, 99), 2),
+            "rps": round(len(timings) / wall, 1),
+            "queries": queries,
+        }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result["p95"] > expected["p95"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {result['p95']}ms > {expected['p95']}ms"
+            )
+        if (result["queries"] or 0) > (expected["queries"] or 0):
+            regressions.append(
+                f"{name}: {result['queries']} queries > {expected['queries']}"
+            )
+    return regressions
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.set_defaults(comments=30000)
+    parser.add_argument(
+        "--runner", choices=("client", "wsgi", "asgi"), default="client"
+    )
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    options = parser.parse_args()
+    prepare_database(options)
+    logging.disable(logging.INFO)
+
+    results = benchmark(options)
+    print(
+        f"{'scenario':<18}{'p50':>9}{'p95':>9}{'p99':>9}{'rps':>9}{'sql':>5}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:<18}{result['p50']:>9}{result['p95']:>9}"
+            f"{result['p99']:>9}{result['rps']:>9}{result['queries']:>5}"
+        )
+
+    baselines = {}
+    if BASELINES.exists():
+        baselines = json.loads(BASELINES.read_text())
+    if options.save_baseline:
+        baselines[options.runner] = results
+        BASELINES.write_text(json.dumps(baselines, indent=2) + "\n")
+    if options.compare:
+        regressions = compare(
+            results, baselines.get(options.runner, {}), options.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path(
+        'posts/',
+        views.PostListView.as_view(),
+        name='posts'
+    ),
+    path(
+        'posts/<int:post_pk>/',
+        views.PostDetailView.as_view(),
+        name='post_detail'
+    ),
+    path(
+        'posts/<int:post_pk>/comments/',
+        views.CommentListView.as_view(),
+        name='post_comments'
+    ),
+    path(
+        'categories/<slug:category_slug>/posts/',
+        views.CategoryPostListView.as_view(),
+        name='category_posts'
+    ),
+    path(
+        'profiles/<str:username>/posts/',
+        views.ProfilePostListView.as_view(),
+        name='profile_posts'
+    ),
+]
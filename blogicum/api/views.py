@@ -0,0 +1,227 @@
+"""Read-only JSON API, version 1.
+
+Every endpoint shows what an anonymous reader sees on the site: posts come
+from the published_posts manager. Rows are read with values() and go out
+as they are, without model instances. ``?fields=`` picks the columns to
+select, and lists leave the post text out unless it is asked for. Lists
+use the same keyset pagination as the HTML feeds (``?cursor=``,
+``?limit=``). ETags are built from the feed versions in the cache, so a
+client polling an unchanged resource gets a 304 without a single query.
+"""
+from django.core.exceptions import BadRequest
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views import View
+
+from blog.cache import (
+    category_feed, comments_feed, conditional_response, feed_etag,
+    index_feed, profile_feed, profile_header,
+)
+from blog.models import Category, Comment, Post
+from blog.paginators import CursorPaginator
+from blogicum.constants import (
+    API_MAX_PAGE_SIZE, COMMENTS_PER_PAGE, POSTS_PER_PAGE
+)
+
+POST_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "excerpt": "excerpt",
+    "text": "text",
+    "pub_date": "pub_date",
+    "author": "author__username",
+    "category": "category__slug",
+    "location": "location__name",
+    "comment_count": "comment_count",
+    "image": "image",
+}
+POST_LIST_FIELDS = tuple(name for name in POST_FIELDS if name != "text")
+COMMENT_FIELDS = {
+    "id": "id",
+    "text": "text",
+    "created_at": "created_at",
+    "author": "author__username",
+}
+
+
+def image_url(name):
+    if not name:
+        return None
+    return Post._meta.get_field("image").storage.url(name)
+
+
+CONVERTERS = {"image": image_url}
+
+
+def json_response(data, status=200):
+    return JsonResponse(
+        data, status=status, json_dumps_params={"ensure_ascii": False}
+    )
+
+
+class ApiView(View):
+    """Validators, errors and field selection shared by the endpoints."""
+
+    fields = POST_FIELDS
+    default_fields = tuple(POST_FIELDS)
+    always_read = ("id",)
+
+    def get_object(self):
+        return None
+
+    def get_feed(self):
+        """Feed whose version changes whenever the response may change."""
+        return index_feed()
+
+    def get_etag(self):
+        return feed_etag(
+            "api", self.get_feed(), self.request.get_full_path()
+        )
+
+    def selected_fields(self):
+        requested = self.request.GET.get("fields")
+        if not requested:
+            return self.default_fields
+        names = tuple(dict.fromkeys(
+            name.strip() for name in requested.split(",") if name.strip()
+        ))
+        unknown = [name for name in names if name not in self.fields]
+        if unknown or not names:
+            raise BadRequest(
+                f"Неизвестные поля: {', '.join(unknown)}. "
+                f"Доступны: {', '.join(self.fields)}."
+            )
+        return names
+
+    def lookups(self, names):
+        """Columns to select; id and the ordering field are always read."""
+        return {self.fields[name] for name in names} | set(self.always_read)
+
+    def serialize(self, row, names):
+        return {
+            name: CONVERTERS.get(name, lambda value: value)(
+                row[self.fields[name]]
+            )
+            for name in names
+        }
+
+    def get(self, request, *args, **kwargs):
+        try:
+            self.object = self.get_object()
+            return conditional_response(
+                request,
+                lambda: json_response(self.get_data()),
+                self.get_etag(),
+            )
+        except Http404:
+            return json_response({"detail": "Не найдено."}, status=404)
+        except BadRequest as error:
+            return json_response({"detail": str(error)}, status=400)
+
+
+class CursorListMixin:
+    ordering = ("-pub_date", "-id")
+    page_size = POSTS_PER_PAGE
+
+    @property
+    def always_read(self):
+        return ("id", self.ordering[0].lstrip("-"))
+
+    def get_page_size(self):
+        limit = self.request.GET.get("limit")
+        if limit is None:
+            return self.page_size
+        if not limit.isdigit() or not 1 <= int(limit) <= API_MAX_PAGE_SIZE:
+            raise BadRequest(
+                f"limit должен быть числом от 1 до {API_MAX_PAGE_SIZE}."
+            )
+        return int(limit)
+
+    def get_data(self):
+        names = self.selected_fields()
+        paginator = CursorPaginator(
+            self.get_queryset().values(*self.lookups(names)),
+            self.get_page_size(),
+            self.ordering,
+        )
+        try:
+            page = paginator.page(self.request.GET.get("cursor"))
+        except Http404 as error:
+            # A cursor that does not decode is the client's mistake.
+            raise BadRequest(str(error))
+        return {
+            "results": [self.serialize(row, names) for row in page],
+            "next_cursor": page.next_cursor,
+            "previous_cursor": page.previous_cursor,
+        }
+
+
+class PostListView(CursorListMixin, ApiView):
+    default_fields = POST_LIST_FIELDS
+
+    def get_queryset(self):
+        return Post.published_posts.all()
+
+
+class CategoryPostListView(PostListView):
+    def get_object(self):
+        return get_object_or_404(
+            Category.objects.only("id"),
+            slug=self.kwargs["category_slug"],
+            is_published=True,
+        )
+
+    def get_feed(self):
+        return category_feed(self.object.id)
+
+    def get_queryset(self):
+        return Post.published_posts.filter(category_id=self.object.id)
+
+
+class ProfilePostListView(PostListView):
+    def get_object(self):
+        header = profile_header(self.kwargs["username"])
+        if header is None:
+            raise Http404
+        return header
+
+    def get_feed(self):
+        return profile_feed(self.object["id"])
+
+    def get_queryset(self):
+        return Post.published_posts.filter(author_id=self.object["id"])
+
+
+class PostDetailView(ApiView):
+    def get_data(self):
+        names = self.selected_fields()
+        row = (
+            Post.published_posts
+            .filter(pk=self.kwargs["post_pk"])
+            .values(*self.lookups(names))
+            .first()
+        )
+        if row is None:
+            raise Http404
+        return self.serialize(row, names)
+
+
+class CommentListView(CursorListMixin, ApiView):
+    fields = COMMENT_FIELDS
+    default_fields = tuple(COMMENT_FIELDS)
+    ordering = ("created_at", "id")
+    page_size = COMMENTS_PER_PAGE
+
+    def get_feed(self):
+        return comments_feed(self.kwargs["post_pk"])
+
+    def get_data(self):
+        # Checked only when the list is built: every comment and every
+        # change to the post bump the comments feed.
+        posts = Post.published_posts.filter(pk=self.kwargs["post_pk"])
+        if not posts.exists():
+            raise Http404
+        return super().get_data()
+
+    def get_queryset(self):
+        return Comment.objects.filter(post_id=self.kwargs["post_pk"])
@@ -1,6 +1,9 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR
 
-from .models import Category, Comment, Location, Post
+from blogicum.constants import SEARCH_ADMIN_RANKED
+from search.backends import SearchResults
+from .models import Category, Comment, ImageJob, Location, Post
 
 
 class CommentInline(admin.StackedInline):
@@ -39,6 +42,20 @@ class PostAdmin(admin.ModelAdmin):
         'title',
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        """Look posts up in the search index instead of scanning titles."""
+        results = SearchResults(search_term, queryset)
+        if results.ranking is None:
+            return super().get_search_results(request, queryset, search_term)
+        queryset = results.filter(SEARCH_ADMIN_RANKED)
+        if ORDER_VAR not in request.GET:
+            # The change list is ordered before the search runs: put the
+            # best matches first unless a column was picked for sorting.
+            queryset = queryset.order_by(
+                'search_rank', *queryset.query.order_by
+            )
+        return queryset, False
+
 
 class PostInline(admin.StackedInline):
     model = Post
@@ -73,3 +90,33 @@ class CommentAdmin(admin.ModelAdmin):
         'created_at',
         'author',
     )
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and 'post' in form.changed_data:
+            Post.objects.filter(
+                pk__in=(form.initial['post'], obj.post_id)
+            ).recount_comments()
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'source',
+        'post',
+        'status',
+        'attempts',
+        'created_at',
+        'finished_at',
+    )
+    list_filter = (
+        'status',
+    )
+    readonly_fields = (
+        'post',
+        'source',
+        'attempts',
+        'error',
+        'claimed_at',
+        'finished_at',
+    )
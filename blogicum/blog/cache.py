@@ -0,0 +1,195 @@
+import math
+import time
+from hashlib import md5
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from blogicum.constants import (
+    FEED_CACHE_TIMEOUT, PROFILE_CACHE_TIMEOUT, SITEMAP_CHUNK_SIZE
+)
+from .models import Post
+
+EPOCH = "epoch"
+VERSION_KEY = "blog:feed-version:{}"
+PROFILE_KEY = "blog:profile:{}"
+NOTHING_SCHEDULED = "nothing-scheduled"
+NOTHING_PUBLISHED = "nothing-published"
+
+
+def index_feed():
+    return "index"
+
+
+def category_feed(category_id):
+    return f"category:{category_id}"
+
+
+def profile_feed(author_id):
+    return f"profile:{author_id}"
+
+
+def comments_feed(post_id):
+    return f"comments:{post_id}"
+
+
+def sitemap_feed(kind, chunk):
+    return f"sitemap-{kind}:{chunk}"
+
+
+def id_chunk(pk):
+    """Number of the sitemap chunk that lists the object with this id."""
+    return pk // SITEMAP_CHUNK_SIZE
+
+
+def post_feeds(post):
+    """Feeds a post is listed in, as of its current field values."""
+    return (
+        index_feed(),
+        category_feed(post.category_id),
+        profile_feed(post.author_id),
+        comments_feed(post.id),
+        sitemap_feed("posts", id_chunk(post.id)),
+        sitemap_feed("profiles", id_chunk(post.author_id)),
+    )
+
+
+def feed_versions(*feeds):
+    keys = [VERSION_KEY.format(feed) for feed in feeds]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_feeds(*feeds):
+    """Invalidate everything cached for the given feeds.
+
+    Versions are timestamps rather than counters, so a version evicted from
+    the cache can never come back with a value it already had.
+    """
+    version = time.time_ns()
+    cache.set_many(
+        {VERSION_KEY.format(feed): version for feed in set(feeds)}, None
+    )
+
+
+def feed_cache_key(prefix, feed, *parts):
+    versions = ".".join(map(str, feed_versions(EPOCH, feed)))
+    return ":".join(map(str, ("blog", prefix, feed, versions, *parts)))
+
+
+def next_publication():
+    """pub_date of the nearest scheduled post, or None.
+
+    The lookup walks post_published_feed_idx and is cached until any post
+    changes, since saving a post is the only way to schedule another one.
+    """
+    key = feed_cache_key("next-publication", index_feed())
+    pub_date = cache.get(key)
+    if pub_date is None or (
+        pub_date != NOTHING_SCHEDULED and pub_date <= timezone.now()
+    ):
+        pub_date = (
+            Post.objects
+            .filter(is_published=True, pub_date__gt=timezone.now())
+            .order_by("pub_date")
+            .values_list("pub_date", flat=True)
+            .first()
+        ) or NOTHING_SCHEDULED
+        cache.set(key, pub_date, FEED_CACHE_TIMEOUT)
+    return None if pub_date == NOTHING_SCHEDULED else pub_date
+
+
+def feed_timeout():
+    """How long a published feed may be cached.
+
+    Never past the moment the next scheduled post becomes visible.
+    """
+    pub_date = next_publication()
+    if pub_date is None:
+        return FEED_CACHE_TIMEOUT
+    seconds = (pub_date - timezone.now()).total_seconds()
+    return min(FEED_CACHE_TIMEOUT, math.ceil(seconds))
+
+
+def newest_publication(feed, posts):
+    """pub_date of the newest of ``posts``, the public part of ``feed``.
+
+    Cached like the pages of the feed: until one of its posts changes or
+    the next scheduled post comes out.
+    """
+    key = feed_cache_key("newest", feed)
+    pub_date = cache.get(key)
+    if pub_date is None:
+        pub_date = (
+            posts.order_by("-pub_date")
+            .values_list("pub_date", flat=True)
+            .first()
+        ) or NOTHING_PUBLISHED
+        cache.set(key, pub_date, feed_timeout())
+    return None if pub_date == NOTHING_PUBLISHED else pub_date
+
+
+def feed_etag(prefix, feed, *parts):
+    """Quoted ETag of a response built from ``feed``.
+
+    It changes with the feed version and once a scheduled post comes out.
+    """
+    key = feed_cache_key(prefix, feed, next_publication(), *parts)
+    return f'"{md5(key.encode()).hexdigest()}"'
+
+
+def conditional_response(request, build, etag, last_modified=None):
+    """Answer 304 if the client is up to date, else with ``build()``.
+
+    ``last_modified`` is a timestamp, like ``newest_publication()``'s.
+    """
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        response = build()
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+def profile_header(username):
+    """What the profile page shows about a user, or None.
+
+    Cached until the user is saved, see ``forget_profile``.
+    """
+    key = PROFILE_KEY.format(username)
+    header = cache.get(key)
+    if header is None:
+        user = (
+            get_user_model().objects
+            .filter(username=username)
+            .only(
+                "username", "first_name", "last_name", "date_joined",
+                "is_staff",
+            )
+            .first()
+        )
+        if user is None:
+            return None
+        header = {
+            "id": user.id,
+            "username": user.username,
+            "full_name": user.get_full_name(),
+            "date_joined": user.date_joined,
+            "is_staff": user.is_staff,
+        }
+        cache.set(key, header, PROFILE_CACHE_TIMEOUT)
+    return header
+
+
+def forget_profile(*usernames):
+    cache.delete_many([PROFILE_KEY.format(name) for name in usernames])
@@ -0,0 +1,149 @@
+"""RSS and Atom feeds of the index, a category and an author.
+
+Aggregators poll these often, so every response carries an ETag built
+from the feed version (see blog.cache) and a Last-Modified taken from the
+newest public post. Both come from the cache, and a poll with nothing new
+gets a 304 without touching the post table.
+"""
+from functools import partial
+
+from django.contrib.syndication.views import Feed
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+
+from blogicum.constants import SYNDICATION_ITEMS
+from .cache import (
+    category_feed, conditional_response, feed_etag, index_feed,
+    newest_publication, profile_feed, profile_header,
+)
+from .models import Category, Post
+
+
+class PostFeed(Feed):
+    """The newest public posts, as RSS 2.0."""
+
+    title = "Блогикум"
+    description = "Новые публикации Блогикума."
+
+    def feed_name(self, obj):
+        return index_feed()
+
+    def link(self, obj):
+        return reverse("blog:index")
+
+    def posts(self, obj):
+        return Post.published_posts.all()
+
+    def items(self, obj):
+        return (
+            self.posts(obj)
+            .select_related("author", "category")
+            .only(
+                "id", "title", "excerpt", "pub_date", "author__username",
+                "category__title",
+            )
+            .order_by("-pub_date")[:SYNDICATION_ITEMS]
+        )
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.excerpt
+
+    def item_link(self, post):
+        return reverse("blog:post_detail", kwargs={"post_pk": post.id})
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_author_name(self, post):
+        return post.author.username
+
+    def item_categories(self, post):
+        return (post.category.title,)
+
+    def __call__(self, request, *args, **kwargs):
+        obj = self.get_object(request, *args, **kwargs)
+        feed = self.feed_name(obj)
+        newest = newest_publication(feed, self.posts(obj))
+        return conditional_response(
+            request,
+            partial(super().__call__, request, *args, **kwargs),
+            feed_etag("syndication", feed, self.feed_type.__name__),
+            int(newest.timestamp()) if newest else None,
+        )
+
+
+class CategoryPostFeed(PostFeed):
+    """The newest public posts of a published category."""
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category.objects.only("id", "slug", "title", "description"),
+            slug=category_slug,
+            is_published=True,
+        )
+
+    def feed_name(self, category):
+        return category_feed(category.id)
+
+    def title(self, category):
+        return f"Блогикум: {category.title}"
+
+    def description(self, category):
+        return category.description
+
+    def link(self, category):
+        return reverse(
+            "blog:category_posts", kwargs={"category_slug": category.slug}
+        )
+
+    def posts(self, category):
+        return Post.published_posts.filter(category_id=category.id)
+
+
+class AuthorPostFeed(PostFeed):
+    """The newest public posts of an author."""
+
+    def get_object(self, request, username):
+        header = profile_header(username)
+        if header is None:
+            raise Http404
+        return header
+
+    def feed_name(self, author):
+        return profile_feed(author["id"])
+
+    def title(self, author):
+        return f"Блогикум: @{author['username']}"
+
+    def description(self, author):
+        return f"Публикации пользователя {author['username']}."
+
+    def link(self, author):
+        return reverse("blog:profile", kwargs={"username": author["username"]})
+
+    def posts(self, author):
+        return Post.published_posts.filter(author_id=author["id"])
+
+
+class AtomPostFeed(PostFeed):
+    feed_type = Atom1Feed
+    subtitle = PostFeed.description
+
+
+class AtomCategoryPostFeed(CategoryPostFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, category):
+        return category.description
+
+
+class AtomAuthorPostFeed(AuthorPostFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, author):
+        return self.description(author)
@@ -2,6 +2,7 @@ from django import forms
 from django.contrib.auth import get_user_model
 
 from .models import Comment, Post
+from .uploads import LimitedImageField
 
 User = get_user_model()
 
@@ -10,6 +11,9 @@ class PostForm(forms.ModelForm):
     class Meta:
         model = Post
         exclude = ('is_published', 'author')
+        field_classes = {
+            'image': LimitedImageField,
+        }
         widgets = {
             'pub_date': forms.DateTimeInput(attrs={'type': 'datetime-local'})
         }
@@ -0,0 +1,123 @@
+"""Resized, content-hashed copies (renditions) of post images.
+
+``Post.renditions`` records them as ``{"source": name, "images": [...]}``.
+"""
+import hashlib
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from blogicum.constants import (
+    IMAGE_MAX_SIZE, RENDITION_FORMATS, RENDITION_WIDTHS
+)
+
+MIME_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg"}
+SAVE_OPTIONS = {
+    "webp": {"quality": 80, "method": 4},
+    "jpeg": {"quality": 82, "optimize": True, "progressive": True},
+    "png": {"optimize": True},
+}
+EXTENSIONS = {"webp": "webp", "jpeg": "jpg", "png": "png"}
+
+
+def rendition_widths(width):
+    """Target widths for an image ``width`` pixels wide, never upscaling."""
+    widths = [target for target in RENDITION_WIDTHS if target < width]
+    if width <= RENDITION_WIDTHS[-1]:
+        widths.append(width)
+    return widths
+
+
+def encode(image, image_format):
+    if image_format == "jpeg" and image.mode != "RGB":
+        image = image.convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, image_format.upper(), **SAVE_OPTIONS[image_format])
+    return buffer.getvalue()
+
+
+def rendition_name(source, width, image_format, content):
+    stem = os.path.splitext(source)[0]
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    return f"{stem}.{width}w.{digest}.{EXTENSIONS[image_format]}"
+
+
+def load_image(field_file):
+    """Decode ``field_file`` upright, in RGB(A) and without metadata."""
+    with field_file.open("rb"):
+        with Image.open(field_file) as original:
+            image = ImageOps.exif_transpose(original)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert(
+            "RGBA" if "transparency" in image.info else "RGB"
+        )
+    return image
+
+
+def write_renditions(image, source, storage):
+    images = []
+    for width in rendition_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS)
+        for image_format in RENDITION_FORMATS:
+            content = encode(resized, image_format)
+            name = rendition_name(source, width, image_format, content)
+            if not storage.exists(name):
+                name = storage.save(name, ContentFile(content))
+            images.append(
+                {"format": image_format, "width": width, "name": name}
+            )
+    return {"source": source, "images": images}
+
+
+def make_renditions(field_file):
+    """Write renditions of ``field_file`` and describe them."""
+    return write_renditions(
+        load_image(field_file), field_file.name, field_file.storage
+    )
+
+
+def process_upload(field_file):
+    """Save the original again without EXIF; return its name, renditions."""
+    image = load_image(field_file)
+    image.thumbnail((IMAGE_MAX_SIZE, IMAGE_MAX_SIZE), Image.LANCZOS)
+    image_format = "jpeg" if image.mode == "RGB" else "png"
+    content = encode(image, image_format)
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    stem = os.path.splitext(field_file.name)[0]
+    name = field_file.storage.save(
+        f"{stem}.{digest}.{EXTENSIONS[image_format]}", ContentFile(content)
+    )
+    return name, write_renditions(image, name, field_file.storage)
+
+
+def delete_renditions(renditions, storage):
+    for image in renditions.get("images", ()):
+        storage.delete(image["name"])
+
+
+def image_sources(renditions, storage):
+    """``(MIME type, srcset)`` pairs in the preferred format order."""
+    sources = []
+    for image_format in RENDITION_FORMATS:
+        srcset = ", ".join(
+            f"{storage.url(image['name'])} {image['width']}w"
+            for image in renditions.get("images", ())
+            if image["format"] == image_format
+        )
+        if srcset:
+            sources.append((MIME_TYPES[image_format], srcset))
+    return sources
+
+
+def fallback_url(renditions, storage):
+    """URL of the widest JPEG rendition, for browsers without srcset."""
+    jpegs = [
+        image for image in renditions.get("images", ())
+        if image["format"] == "jpeg"
+    ]
+    if not jpegs:
+        return None
+    return storage.url(max(jpegs, key=lambda image: image["width"])["name"])
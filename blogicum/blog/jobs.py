@@ -0,0 +1,101 @@
+"""Background processing of uploaded post images.
+
+Saving a post with a new image only queues an ImageJob; the upload itself
+is stored as is. Workers started by ``manage.py process_images`` claim
+jobs from the table, re-encode the original without EXIF, generate its
+renditions and swap them into the post.
+"""
+import logging
+import threading
+
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from blogicum.constants import IMAGE_JOB_MAX_ATTEMPTS
+from .cache import bump_feeds, post_feeds
+from .images import delete_renditions, process_upload
+from .models import ImageJob, Post
+
+logger = logging.getLogger("blogicum.images")
+
+
+def finish(job, status, error=""):
+    ImageJob.objects.filter(pk=job.pk).update(
+        status=status, error=error, finished_at=timezone.now()
+    )
+
+
+def run_job(job):
+    post = Post.objects.filter(pk=job.post_id).first()
+    if post is None or post.image.name != job.source:
+        # The post was deleted or got another image in the meantime.
+        finish(job, ImageJob.Status.DONE, "Фото публикации изменилось.")
+        return
+    storage = post.image.storage
+    name, renditions = process_upload(post.image)
+    swapped = Post.objects.filter(pk=post.pk, image=job.source).update(
+        image=name, renditions=renditions, updated_at=timezone.now()
+    )
+    if swapped:
+        storage.delete(job.source)
+        delete_renditions(post.renditions, storage)
+        bump_feeds(*post_feeds(post))
+    else:
+        storage.delete(name)
+        delete_renditions(renditions, storage)
+    finish(job, ImageJob.Status.DONE)
+
+
+def run_next():
+    """Process one job; False when the queue has nothing to claim."""
+    job = ImageJob.objects.claim()
+    if job is None:
+        return False
+    try:
+        run_job(job)
+    except Exception as error:
+        logger.exception("Image job %s failed", job.pk)
+        if job.attempts >= IMAGE_JOB_MAX_ATTEMPTS:
+            finish(job, ImageJob.Status.FAILED, str(error))
+        else:
+            ImageJob.objects.filter(pk=job.pk).update(
+                status=ImageJob.Status.PENDING, error=str(error)
+            )
+    return True
+
+
+def drain():
+    """Process jobs in the current thread until none can be claimed."""
+    processed = 0
+    while run_next():
+        processed += 1
+    return processed
+
+
+def work(stop, poll_interval, exit_when_idle):
+    """Worker thread loop, until ``stop`` is set."""
+    try:
+        while not stop.is_set():
+            close_old_connections()
+            if not run_next():
+                if exit_when_idle:
+                    return
+                stop.wait(poll_interval)
+    finally:
+        connection.close()
+
+
+def start_workers(count, poll_interval, exit_when_idle=False):
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=work,
+            args=(stop, poll_interval, exit_when_idle),
+            name=f"image-worker-{number}",
+            daemon=True,
+        )
+        for number in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    return stop, threads
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import EPOCH, bump_feeds
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = "Заполняет анонсы публикаций по их текстам."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Сколько публикаций обновлять одним запросом.",
+        )
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="Обработать только публикации без анонса.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        posts = Post.objects.only("id", "text")
+        if options["missing"]:
+            posts = posts.filter(excerpt="")
+        last_id = 0
+        updated = 0
+        while True:
+            batch = list(
+                posts.filter(id__gt=last_id).order_by("id")[:batch_size]
+            )
+            if not batch:
+                break
+            for post in batch:
+                post.excerpt = Post.make_excerpt(post.text)
+            Post.objects.bulk_update(batch, ["excerpt"])
+            updated += len(batch)
+            last_id = batch[-1].id
+        if updated:
+            # bulk_update() sends no signals: start cached pages and cards
+            # over so they show the new excerpts.
+            bump_feeds(EPOCH)
+        self.stdout.write(self.style.SUCCESS(f"Обновлено анонсов: {updated}"))
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = "Создаёт уменьшенные копии фото публикаций."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Сколько публикаций загружать одним запросом.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Пересоздать копии, даже если они уже есть.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        posts = (
+            Post.objects
+            .exclude(image="")
+            .only("id", "image", "renditions")
+        )
+        last_id = 0
+        updated = 0
+        failed = 0
+        while True:
+            batch = list(
+                posts.filter(id__gt=last_id).order_by("id")[:batch_size]
+            )
+            if not batch:
+                break
+            for post in batch:
+                if (
+                    not options["force"]
+                    and post.renditions.get("source") == post.image.name
+                ):
+                    continue
+                try:
+                    post.refresh_renditions()
+                except OSError as error:
+                    failed += 1
+                    self.stderr.write(f"Публикация {post.id}: {error}")
+                else:
+                    updated += 1
+            last_id = batch[-1].id
+        self.stdout.write(
+            self.style.SUCCESS(f"Обработано фото: {updated}, ошибок: {failed}")
+        )
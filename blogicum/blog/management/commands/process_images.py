@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from blog.jobs import start_workers
+
+
+class Command(BaseCommand):
+    help = "Обрабатывает загруженные фото публикаций в фоне."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="Сколько фото обрабатывать одновременно.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Через сколько секунд проверять очередь, когда она пуста.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Завершиться, когда очередь опустеет.",
+        )
+
+    def handle(self, *args, **options):
+        stop, threads = start_workers(
+            options["workers"], options["poll_interval"], options["once"]
+        )
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(1)
+        except KeyboardInterrupt:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        self.stdout.write(self.style.SUCCESS("Обработка фото завершена"))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает количество комментариев у публикаций."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Сколько публикаций обновлять в одной транзакции.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = Post.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+        updated = 0
+        for start in range(0, last_id, batch_size):
+            with transaction.atomic():
+                updated += Post.objects.filter(
+                    id__gt=start, id__lte=start + batch_size
+                ).recount_comments()
+        self.stdout.write(
+            self.style.SUCCESS(f"Пересчитано публикаций: {updated}")
+        )
@@ -1,43 +1,133 @@
+from datetime import timedelta
+
 from django.db import models
 from django.utils import timezone
-from django.db.models import Count
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 
+from blogicum.constants import IMAGE_JOB_MAX_ATTEMPTS, IMAGE_JOB_TIMEOUT
 
-class PostsManager(models.Manager):
-    def get_queryset(self):
-        return (
-            super()
-            .get_queryset()
-            .filter(
-                pub_date__lte=timezone.now(),
-                is_published=True,
-                category__is_published=True,
-                location__is_published=True,
-            )
+FEED_RELATED = ("author", "category", "location")
+FEED_FIELDS = (
+    "id",
+    "title",
+    "excerpt",
+    "pub_date",
+    "image",
+    "renditions",
+    "is_published",
+    "comment_count",
+    "updated_at",
+    "author__username",
+    "category__slug",
+    "category__title",
+    "category__is_published",
+    "location__name",
+    "location__is_published",
+)
+
+
+class PostQuerySet(models.QuerySet):
+    def published(self):
+        return self.filter(
+            pub_date__lte=timezone.now(),
+            is_published=True,
+            category__is_published=True,
+            location__is_published=True,
         )
 
+    def shift_comment_count(self, delta):
+        return self.update(comment_count=F("comment_count") + delta)
 
-class CommentManager(models.Manager):
+    def recount_comments(self):
+        """Rewrite the denormalized comment_count from the comment table."""
+        comment_model = self.model.comment.field.model
+        comments = (
+            comment_model.objects
+            .filter(post=OuterRef("pk"))
+            .order_by()
+            .values("post")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        return self.update(comment_count=Coalesce(Subquery(comments), 0))
+
+    def for_feed(self):
+        """Join everything includes/post_card.html touches in one query."""
+        return self.select_related(*FEED_RELATED).only(*FEED_FIELDS)
+
+
+PostManager = models.Manager.from_queryset(PostQuerySet)
+
+
+class PostsManager(PostManager):
+    def get_queryset(self):
+        return super().get_queryset().published()
+
+
+class CommentManager(PostManager):
     def get_queryset(self):
         return (
             super()
             .get_queryset()
-            .annotate(comment_count=Count("comment"))
+            .for_feed()
             .order_by("-pub_date")
         )
 
 
-class PublishedPostsCommentManager(models.Manager):
+class PublishedPostsCommentManager(PostManager):
     def get_queryset(self):
         return (
             super()
             .get_queryset()
-            .filter(
-                pub_date__lte=timezone.now(),
-                is_published=True,
-                category__is_published=True,
-                location__is_published=True,
-            )
-            .annotate(comment_count=Count("comment"))
+            .published()
+            .for_feed()
             .order_by("-pub_date")
         )
+
+
+class ImageJobQuerySet(models.QuerySet):
+    def unfinished(self):
+        Status = self.model.Status
+        return self.filter(status__in=(Status.PENDING, Status.RUNNING))
+
+    def enqueue(self, post):
+        """Queue processing of the post's current image, once."""
+        source = post.image.name
+        if not self.unfinished().filter(post=post, source=source).exists():
+            return self.create(post=post, source=source)
+        return None
+
+    def claimable(self):
+        """Pending jobs and jobs of silent workers, with retries left."""
+        Status = self.model.Status
+        stale = timezone.now() - timedelta(seconds=IMAGE_JOB_TIMEOUT)
+        return self.filter(
+            Q(status=Status.PENDING)
+            | Q(status=Status.RUNNING, claimed_at__lt=stale),
+            attempts__lt=IMAGE_JOB_MAX_ATTEMPTS,
+        )
+
+    def claim(self):
+        """Take the oldest claimable job, or return None.
+
+        A job belongs to the worker whose conditional UPDATE flipped it to
+        running, so concurrent workers never process the same job.
+        """
+        candidates = (
+            self.claimable()
+            .order_by("created_at", "id")
+            .values_list("id", flat=True)[:10]
+        )
+        for job_id in candidates:
+            claimed = self.claimable().filter(pk=job_id).update(
+                status=self.model.Status.RUNNING,
+                claimed_at=timezone.now(),
+                attempts=F("attempts") + 1,
+            )
+            if claimed:
+                return self.get(pk=job_id)
+        return None
+
+
+ImageJobManager = models.Manager.from_queryset(ImageJobQuerySet)
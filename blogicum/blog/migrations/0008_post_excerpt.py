@@ -0,0 +1,36 @@
+# Generated by Django 4.2.13 on 2026-10-18 03:50
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+EXCERPT_WORDS = 10
+BATCH_SIZE = 1000
+
+
+def fill_excerpts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = Post._default_manager.only('id', 'text').iterator()
+    batch = []
+    for post in posts:
+        post.excerpt = Truncator(post.text).words(EXCERPT_WORDS, truncate=' …')
+        batch.append(post)
+        if len(batch) == BATCH_SIZE:
+            Post._default_manager.bulk_update(batch, ['excerpt'])
+            batch = []
+    Post._default_manager.bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Анонс'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
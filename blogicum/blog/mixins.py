@@ -1,9 +1,19 @@
+from hashlib import md5
+
+from django.conf import settings
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.core.cache import cache
+from django.http import HttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 
+from blogicum.constants import POST_CARD_CACHE_TIMEOUT, POSTS_PER_PAGE
+from .cache import EPOCH, feed_cache_key, feed_timeout, feed_versions
 from .forms import PostForm
 from .models import Comment, Post
+from .paginators import CursorPaginator, FeedPaginator
+from .uploads import ImageUploadHandler
 
 
 class PostMixin:
@@ -11,11 +21,27 @@ class PostMixin:
     form_class = PostForm
     template_name = "blog/create.html"
 
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # CSRF is checked in dispatch(), after the upload handler is added.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def dispatch(self, request, *args, **kwargs):
+        request.upload_handlers.insert(0, ImageUploadHandler(request))
+        return csrf_protect(super().dispatch)(request, *args, **kwargs)
+
 
 class AuthorPermissionMixin(UserPassesTestMixin):
 
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, "_author_object"):
+            self._author_object = super().get_object()
+        return self._author_object
+
     def test_func(self):
-        return self.get_object().author == self.request.user
+        return self.get_object().author_id == self.request.user.pk
 
     def handle_no_permission(self):
         return redirect("blog:post_detail", post_pk=self.get_object().id)
@@ -34,3 +60,65 @@ class CommentMixin:
             "blog:post_detail",
             kwargs={"post_pk": self.kwargs["pk"]}
         )
+
+
+class CursorPaginationMixin:
+
+    cursor_ordering = ("-pub_date", "-id")
+
+    def uses_cursor_pagination(self):
+        return (
+            getattr(settings, "BLOG_CURSOR_PAGINATION", False)
+            or "cursor" in self.request.GET
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.uses_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size, self.cursor_ordering)
+        page = paginator.page(self.request.GET.get("cursor"))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class FeedMixin(CursorPaginationMixin):
+
+    paginate_by = POSTS_PER_PAGE
+    paginator_class = FeedPaginator
+
+    def get_feed(self):
+        return None
+
+    def get_feed_variant(self):
+        return "all"
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        feed = self.get_feed()
+        if feed is not None:
+            kwargs["count_cache_key"] = feed_cache_key(
+                "count", feed, self.get_feed_variant()
+            )
+        return super().get_paginator(queryset, per_page, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(
+            **kwargs,
+            card_cache_timeout=POST_CARD_CACHE_TIMEOUT,
+            card_cache_version=feed_versions(EPOCH)[0],
+        )
+
+    def get(self, request, *args, **kwargs):
+        feed = self.get_feed() if request.user.is_anonymous else None
+        if feed is None:
+            return super().get(request, *args, **kwargs)
+        path = md5(request.get_full_path().encode()).hexdigest()
+        key = feed_cache_key("page", feed, path)
+        content = cache.get(key)
+        if content is not None:
+            return HttpResponse(content)
+        response = super().get(request, *args, **kwargs)
+        response.add_post_render_callback(
+            lambda response: cache.set(
+                key, response.content, feed_timeout()
+            )
+        )
+        return response
@@ -1,10 +1,16 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.text import Truncator
 
 from core.models import BaseModel
-from blogicum.constants import MAX_LENGTH, MAX_TITLE_LENGTH
+from blogicum.constants import EXCERPT_WORDS, MAX_LENGTH, MAX_TITLE_LENGTH
+from .images import (
+    delete_renditions, fallback_url, image_sources, make_renditions
+)
 from .managers import (
-    PostsManager, CommentManager, PublishedPostsCommentManager
+    CommentManager, ImageJobManager, PostManager, PostsManager,
+    PublishedPostsCommentManager
 )
 
 User = get_user_model()
@@ -47,6 +53,11 @@ class Category(BaseModel):
 class Post(BaseModel):
     title = models.CharField(max_length=MAX_LENGTH, verbose_name="Заголовок")
     text = models.TextField(verbose_name="Текст")
+    excerpt = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name="Анонс",
+    )
     pub_date = models.DateTimeField(
         editable=True,
         verbose_name="Дата и время публикации",
@@ -77,9 +88,21 @@ class Post(BaseModel):
         verbose_name="Категория",
     )
     image = models.ImageField("Фото", blank=True, upload_to="post_images")
+    renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name="Уменьшенные копии фото",
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Количество комментариев",
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Изменено")
 
     published_posts = PostsManager()
-    objects = models.Manager()
+    objects = PostManager()
     post_comments = CommentManager()
     published_posts_comments = PublishedPostsCommentManager()
 
@@ -87,6 +110,21 @@ class Post(BaseModel):
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
         ordering = ("-pub_date",)
+        indexes = (
+            models.Index(
+                fields=("-pub_date",),
+                condition=models.Q(is_published=True),
+                name="post_published_feed_idx",
+            ),
+            models.Index(
+                fields=("category", "-pub_date"),
+                name="post_category_feed_idx",
+            ),
+            models.Index(
+                fields=("author", "-pub_date"),
+                name="post_author_feed_idx",
+            ),
+        )
         constraints = (
             models.UniqueConstraint(
                 fields=(
@@ -101,6 +139,61 @@ class Post(BaseModel):
     def __str__(self):
         return self.title[:MAX_TITLE_LENGTH]
 
+    @staticmethod
+    def make_excerpt(text):
+        return Truncator(text).words(EXCERPT_WORDS, truncate=" …")
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "text" in update_fields:
+            self.excerpt = self.make_excerpt(self.text)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "excerpt"}
+        super().save(*args, **kwargs)
+        if update_fields is None or "image" in update_fields:
+            if not self.image:
+                if self.renditions:
+                    self.refresh_renditions()
+            elif self.renditions.get("source") != self.image.name:
+                ImageJob.objects.enqueue(self)
+
+    def refresh_renditions(self):
+        """Regenerate the renditions of the current image, see blog.images."""
+        from .cache import bump_feeds, post_feeds
+
+        stale = self.renditions
+        self.renditions = make_renditions(self.image) if self.image else {}
+        self.updated_at = timezone.now()
+        Post.objects.filter(pk=self.pk).update(
+            renditions=self.renditions, updated_at=self.updated_at
+        )
+        bump_feeds(*post_feeds(self))
+        kept = {image["name"] for image in self.renditions.get("images", ())}
+        delete_renditions(
+            {
+                "images": [
+                    image for image in stale.get("images", ())
+                    if image["name"] not in kept
+                ]
+            },
+            self.image.storage,
+        )
+
+    @property
+    def current_renditions(self):
+        # A replaced image keeps the old renditions until its job is done.
+        if self.renditions.get("source") != self.image.name:
+            return {}
+        return self.renditions
+
+    @property
+    def image_sources(self):
+        return image_sources(self.current_renditions, self.image.storage)
+
+    @property
+    def image_fallback_url(self):
+        return fallback_url(self.current_renditions, self.image.storage)
+
 
 class Comment(models.Model):
     text = models.TextField("Текст комментария")
@@ -116,6 +209,70 @@ class Comment(models.Model):
         verbose_name = "комментарий"
         verbose_name_plural = "Комментарии"
         ordering = ("created_at",)
+        indexes = (
+            models.Index(
+                fields=("post", "created_at"),
+                name="comment_post_created_idx",
+            ),
+        )
 
     def __str__(self):
         return self.text[:MAX_TITLE_LENGTH]
+
+    def save(self, *args, **kwargs):
+        # post_save moves Post.comment_count, see blog.signals.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class ImageJob(models.Model):
+    """Processing of an uploaded post image, done by process_images."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Ожидает"
+        RUNNING = "running", "Выполняется"
+        DONE = "done", "Готово"
+        FAILED = "failed", "Ошибка"
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="image_jobs",
+        verbose_name="Публикация",
+    )
+    source = models.CharField(max_length=MAX_LENGTH, verbose_name="Файл")
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name="Состояние",
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name="Попыток"
+    )
+    error = models.TextField(blank=True, verbose_name="Ошибка")
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name="Добавлено"
+    )
+    claimed_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Взято в работу"
+    )
+    finished_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Завершено"
+    )
+
+    objects = ImageJobManager()
+
+    class Meta:
+        verbose_name = "обработка фото"
+        verbose_name_plural = "Обработка фото"
+        ordering = ("created_at",)
+        indexes = (
+            models.Index(
+                fields=("status", "created_at"),
+                name="imagejob_queue_idx",
+            ),
+        )
+
+    def __str__(self):
+        return self.source[:MAX_TITLE_LENGTH]
@@ -0,0 +1,158 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as DecodeError
+
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.http import Http404
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from blogicum.constants import PAGE_RANGE_ON_EACH_SIDE
+from .cache import feed_timeout
+
+NEXT = "n"
+PREVIOUS = "p"
+
+
+class FeedPage(Page):
+    @property
+    def elided_page_range(self):
+        return self.paginator.get_elided_page_range(
+            self.number, on_each_side=PAGE_RANGE_ON_EACH_SIDE
+        )
+
+
+class FeedPaginator(Paginator):
+    """Page-number paginator that keeps the feed's COUNT(*) in the cache."""
+
+    def __init__(self, *args, count_cache_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_cache_key = count_cache_key
+
+    @cached_property
+    def count(self):
+        if self.count_cache_key is None:
+            return super().count
+        count = cache.get(self.count_cache_key)
+        if count is None:
+            count = super().count
+            cache.set(self.count_cache_key, count, feed_timeout())
+        return count
+
+    def _get_page(self, *args, **kwargs):
+        return FeedPage(*args, **kwargs)
+
+
+class CursorPage:
+    cursor_pagination = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.has_next_page = has_next
+        self.has_previous_page = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.has_next_page
+
+    def has_previous(self):
+        return self.has_previous_page
+
+    def has_other_pages(self):
+        return self.has_next_page or self.has_previous_page
+
+    @property
+    def next_cursor(self):
+        if self.has_next_page and self.object_list:
+            return self.paginator.encode(NEXT, self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous_page and self.object_list:
+            return self.paginator.encode(PREVIOUS, self.object_list[0])
+        return None
+
+
+class CursorPaginator:
+    """Keyset pagination over a (datetime field, id) ordering.
+
+    Every page is fetched with ``WHERE (field, id) < cursor LIMIT n + 1``,
+    so it costs the same regardless of how deep the reader has gone and no
+    COUNT(*) is ever issued.
+    """
+
+    def __init__(self, queryset, per_page, ordering=("-pub_date", "-id")):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = ordering
+        self.descending = ordering[0].startswith("-")
+        self.field = ordering[0].lstrip("-")
+
+    def encode(self, direction, obj):
+        if isinstance(obj, dict):
+            # A row of a values() queryset.
+            value, pk = obj[self.field], obj["id"]
+        else:
+            value, pk = getattr(obj, self.field), obj.pk
+        raw = f"{direction}|{value.isoformat()}|{pk}"
+        return urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode(self, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            raw = urlsafe_b64decode(padded.encode()).decode()
+            direction, value, pk = raw.split("|")
+            value = parse_datetime(value)
+            pk = int(pk)
+        except (DecodeError, UnicodeDecodeError, ValueError):
+            raise Http404("Неверный курсор страницы.")
+        if direction not in (NEXT, PREVIOUS) or value is None:
+            raise Http404("Неверный курсор страницы.")
+        return direction, value, pk
+
+    def _after(self, value, pk, forward):
+        lookup = "lt" if forward == self.descending else "gt"
+        return Q(**{f"{self.field}__{lookup}": value}) | Q(
+            **{self.field: value, f"pk__{lookup}": pk}
+        )
+
+    def page(self, cursor=None):
+        if not cursor:
+            objects = list(
+                self.queryset.order_by(*self.ordering)[:self.per_page + 1]
+            )
+            return CursorPage(
+                objects[:self.per_page], self,
+                has_next=len(objects) > self.per_page,
+                has_previous=False,
+            )
+        direction, value, pk = self.decode(cursor)
+        forward = direction == NEXT
+        ordering = self.ordering if forward else tuple(
+            name[1:] if name.startswith("-") else f"-{name}"
+            for name in self.ordering
+        )
+        objects = list(
+            self.queryset
+            .filter(self._after(value, pk, forward))
+            .order_by(*ordering)[:self.per_page + 1]
+        )
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+        if forward:
+            return CursorPage(
+                objects, self, has_next=has_more, has_previous=True
+            )
+        objects.reverse()
+        return CursorPage(objects, self, has_next=True, has_previous=has_more)
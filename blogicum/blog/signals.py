@@ -0,0 +1,114 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    post_delete, post_init, post_save, pre_delete
+)
+from django.dispatch import receiver
+
+from .cache import (
+    EPOCH, bump_feeds, category_feed, comments_feed, forget_profile, id_chunk,
+    index_feed, post_feeds, profile_feed, sitemap_feed
+)
+from .models import Category, Comment, Location, Post
+
+User = get_user_model()
+deleting = threading.local()
+
+
+def deleting_posts():
+    """Ids of the posts whose delete is running in this thread."""
+    if not hasattr(deleting, "posts"):
+        deleting.posts = set()
+    return deleting.posts
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleted_post(sender, instance, **kwargs):
+    # Every pre_delete of a delete is sent before its cascades run.
+    deleting_posts().add(instance.id)
+
+
+@receiver(post_delete, sender=Post)
+def forget_deleted_post(sender, instance, **kwargs):
+    deleting_posts().discard(instance.id)
+
+
+@receiver(post_init, sender=Post)
+def remember_category(sender, instance, **kwargs):
+    instance._loaded_category_id = instance.__dict__.get("category_id")
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_feeds(sender, instance, **kwargs):
+    bump_feeds(
+        *post_feeds(instance), category_feed(instance._loaded_category_id)
+    )
+    instance._loaded_category_id = instance.category_id
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def count_comments(sender, instance, created=None, **kwargs):
+    # post_delete is sent for queryset and cascade deletes as well, inside
+    # the transaction of the delete.
+    if created is False or instance.post_id in deleting_posts():
+        return
+    Post.objects.filter(pk=instance.post_id).shift_comment_count(
+        1 if created else -1
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_feeds(sender, instance, created=True, **kwargs):
+    if instance.post_id in deleting_posts():
+        # Deleting the post bumps all of its feeds.
+        return
+    bump_feeds(comments_feed(instance.post_id))
+    if not created:
+        # An edit leaves the comment counts in the feeds as they were.
+        return
+    post = (
+        Post.objects
+        .filter(pk=instance.post_id)
+        .values("category_id", "author_id")
+        .first()
+    )
+    if post is not None:
+        bump_feeds(
+            index_feed(),
+            category_feed(post["category_id"]),
+            profile_feed(post["author_id"]),
+        )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_all_feeds(sender, instance, **kwargs):
+    bump_feeds(EPOCH)
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    instance._loaded_username = instance.__dict__.get("username")
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_profile(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    forget_profile(instance.username, instance._loaded_username)
+    bump_feeds(
+        profile_feed(instance.pk),
+        sitemap_feed("profiles", id_chunk(instance.pk)),
+    )
+    if instance._loaded_username not in (None, instance.username):
+        # Cards, feed pages and API answers of every feed may show the old
+        # @username; renames are rare enough to start all of them over.
+        bump_feeds(EPOCH)
+    instance._loaded_username = instance.username
@@ -0,0 +1,151 @@
+"""sitemap.xml for crawlers, split into chunks by id.
+
+``/sitemap.xml`` is a sitemap index pointing at one sitemap for the
+categories and at post and profile sitemaps that each cover
+SITEMAP_CHUNK_SIZE ids. A chunk is built from ``values_list().iterator()``
+over two narrow columns, so no model instances are made and memory does
+not grow with the table. Every document is cached under the version of
+its chunk (see ``blog.cache.post_feeds``): saving a post only rebuilds
+the chunks it is listed in.
+"""
+from xml.sax.saxutils import escape
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Exists, Max, OuterRef
+from django.http import HttpResponse
+from django.urls import reverse
+from django.views.decorators.http import require_safe
+
+from blogicum.constants import SITEMAP_CHUNK_SIZE
+from .cache import (
+    EPOCH, feed_cache_key, feed_timeout, index_feed, sitemap_feed
+)
+from .models import Category, Post
+
+User = get_user_model()
+
+URLSET_START = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+URLSET_END = "</urlset>\n"
+INDEX_START = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+INDEX_END = "</sitemapindex>\n"
+
+
+def url_entry(location, lastmod=None):
+    entry = f"<url><loc>{escape(location)}</loc>"
+    if lastmod is not None:
+        entry += f"<lastmod>{lastmod.date().isoformat()}</lastmod>"
+    return entry + "</url>\n"
+
+
+def chunk_ids(chunk):
+    start = chunk * SITEMAP_CHUNK_SIZE
+    return start, start + SITEMAP_CHUNK_SIZE
+
+
+def cached_xml(request, feed, build):
+    """Serve the document of ``feed``, building it on a cache miss."""
+    key = feed_cache_key("sitemap", feed, request.get_host())
+    content = cache.get(key)
+    if content is None:
+        content = "".join(build(request.build_absolute_uri("/")[:-1]))
+        cache.set(key, content, feed_timeout())
+    return HttpResponse(content, content_type="application/xml")
+
+
+def post_urls(chunk):
+    def build(root):
+        start, end = chunk_ids(chunk)
+        rows = (
+            Post.published_posts
+            .filter(id__gte=start, id__lt=end)
+            .order_by("id")
+            .values_list("id", "updated_at")
+            .iterator(chunk_size=2000)
+        )
+        yield URLSET_START
+        for post_id, updated_at in rows:
+            yield url_entry(
+                root + reverse("blog:post_detail", args=(post_id,)),
+                updated_at,
+            )
+        yield URLSET_END
+    return build
+
+
+def profile_urls(chunk):
+    def build(root):
+        start, end = chunk_ids(chunk)
+        rows = (
+            User.objects
+            .filter(
+                Exists(Post.published_posts.filter(author=OuterRef("pk"))),
+                id__gte=start,
+                id__lt=end,
+            )
+            .order_by("id")
+            .values_list("username", flat=True)
+            .iterator(chunk_size=2000)
+        )
+        yield URLSET_START
+        for username in rows:
+            yield url_entry(root + reverse("blog:profile", args=(username,)))
+        yield URLSET_END
+    return build
+
+
+def category_urls(root):
+    rows = (
+        Category.objects
+        .filter(is_published=True)
+        .order_by("id")
+        .values_list("slug", flat=True)
+        .iterator()
+    )
+    yield URLSET_START
+    for slug in rows:
+        yield url_entry(root + reverse("blog:category_posts", args=(slug,)))
+    yield URLSET_END
+
+
+def index_entries(root):
+    yield INDEX_START
+    locations = [reverse("blog:sitemap_categories")]
+    for kind, model in (("posts", Post), ("profiles", User)):
+        last_id = model.objects.aggregate(last=Max("id"))["last"] or 0
+        locations.extend(
+            reverse(f"blog:sitemap_{kind}", args=(chunk,))
+            for chunk in range(last_id // SITEMAP_CHUNK_SIZE + 1)
+        )
+    for location in locations:
+        yield f"<sitemap><loc>{escape(root + location)}</loc></sitemap>\n"
+    yield INDEX_END
+
+
+@require_safe
+def sitemap_index(request):
+    # New posts bump the index feed, new authors come with their posts.
+    return cached_xml(request, index_feed(), index_entries)
+
+
+@require_safe
+def posts_sitemap(request, chunk):
+    return cached_xml(request, sitemap_feed("posts", chunk), post_urls(chunk))
+
+
+@require_safe
+def profiles_sitemap(request, chunk):
+    return cached_xml(
+        request, sitemap_feed("profiles", chunk), profile_urls(chunk)
+    )
+
+
+@require_safe
+def categories_sitemap(request):
+    return cached_xml(request, EPOCH, category_urls)
@@ -0,0 +1,155 @@
+"""IMAGE_UPLOAD_LIMITS, checked before anything decodes an upload."""
+import warnings
+from io import BytesIO
+
+from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from django.template.defaultfilters import filesizeformat
+from PIL import Image
+
+DEFAULT_LIMITS = {
+    "MAX_BYTES": 10 * 1024 * 1024,
+    "MAX_PIXELS": 50_000_000,
+    "MAX_SIDE": 10000,
+    "FORMATS": ("JPEG", "PNG", "GIF", "WEBP"),
+    "HEADER_BYTES": 256 * 1024,
+}
+
+
+def upload_limits():
+    return {**DEFAULT_LIMITS, **getattr(settings, "IMAGE_UPLOAD_LIMITS", {})}
+
+
+def read_header(data):
+    """``(format, (width, height))`` from the image header, or None."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+        try:
+            with Image.open(BytesIO(data)) as image:
+                return image.format, image.size
+        except Image.DecompressionBombError:
+            # Raised before any decoding; the size is far over our limits.
+            return None, (float("inf"), float("inf"))
+        except (OSError, SyntaxError, ValueError):
+            return None
+
+
+def check_header(header, limits):
+    """Error message for a parsed header, or None if it is acceptable."""
+    image_format, (width, height) = header
+    if width > limits["MAX_SIDE"] or height > limits["MAX_SIDE"]:
+        return (
+            "Изображение слишком большое: сторона не должна превышать "
+            f"{limits['MAX_SIDE']} пикселей."
+        )
+    if width * height > limits["MAX_PIXELS"]:
+        return (
+            "Изображение слишком большое: не более "
+            f"{limits['MAX_PIXELS'] // 1_000_000} мегапикселей."
+        )
+    if image_format not in limits["FORMATS"]:
+        return (
+            "Формат изображения не поддерживается. Допустимые форматы: "
+            f"{', '.join(limits['FORMATS'])}."
+        )
+    return None
+
+
+def size_error(limits):
+    return (
+        "Файл слишком большой: не более "
+        f"{filesizeformat(limits['MAX_BYTES'])}."
+    )
+
+
+INVALID_IMAGE = (
+    "Загрузите правильное изображение. Файл, который вы загрузили, "
+    "поврежден или не является изображением."
+)
+
+
+class RejectedUpload(UploadedFile):
+    """Stands in for an upload the handler refused to store."""
+
+    def __init__(self, name, content_type, rejection):
+        super().__init__(BytesIO(), name, content_type, 0)
+        self.rejection = rejection
+
+
+class ImageUploadHandler(FileUploadHandler):
+    """Enforce IMAGE_UPLOAD_LIMITS while the upload streams in."""
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.limits = upload_limits()
+        self.received = 0
+        self.head = bytearray()
+        self.header_checked = False
+        self.rejection = None
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.rejection:
+            return None
+        self.received += len(raw_data)
+        if self.received > self.limits["MAX_BYTES"]:
+            self.reject(size_error(self.limits))
+            return None
+        if not self.header_checked:
+            self.head += raw_data
+            self.inspect_head(complete=False)
+            if self.rejection:
+                return None
+        return raw_data
+
+    def inspect_head(self, complete):
+        header = read_header(bytes(self.head))
+        if header is not None:
+            self.header_checked = True
+            self.head = bytearray()
+            rejection = check_header(header, self.limits)
+            if rejection:
+                self.reject(rejection)
+        elif complete or len(self.head) >= self.limits["HEADER_BYTES"]:
+            self.reject(INVALID_IMAGE)
+
+    def reject(self, rejection):
+        self.rejection = rejection
+        self.head = bytearray()
+
+    def file_complete(self, file_size):
+        if not self.rejection and not self.header_checked:
+            self.inspect_head(complete=True)
+        if self.rejection:
+            return RejectedUpload(
+                self.file_name, self.content_type, self.rejection
+            )
+        return None
+
+
+class LimitedImageField(forms.ImageField):
+    """ImageField that applies IMAGE_UPLOAD_LIMITS before Pillow decodes."""
+
+    def to_python(self, data):
+        if data in self.empty_values:
+            return super().to_python(data)
+        rejection = getattr(data, "rejection", None)
+        if rejection is None:
+            rejection = self.check(data)
+        if rejection:
+            raise ValidationError(rejection, code="upload_limit")
+        return super().to_python(data)
+
+    def check(self, data):
+        """Limits for files that did not stream through the handler."""
+        limits = upload_limits()
+        if data.size > limits["MAX_BYTES"]:
+            return size_error(limits)
+        data.seek(0)
+        header = read_header(data.read(limits["HEADER_BYTES"]))
+        data.seek(0)
+        if header is None:
+            return INVALID_IMAGE
+        return check_header(header, limits)
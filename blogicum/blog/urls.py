@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import feeds, sitemaps, views
 
 app_name = 'blog'
 
@@ -10,16 +10,41 @@ urlpatterns = [
         views.PostListView.as_view(),
         name='index'
     ),
+    path(
+        'feeds/rss/',
+        feeds.PostFeed(),
+        name='feed_rss'
+    ),
+    path(
+        'feeds/atom/',
+        feeds.AtomPostFeed(),
+        name='feed_atom'
+    ),
     path(
         'posts/<int:post_pk>/',
         views.PostDetailView.as_view(),
         name='post_detail'
     ),
+    path(
+        'posts/<int:post_pk>/comments/',
+        views.PostCommentsView.as_view(),
+        name='post_comments'
+    ),
     path(
         'category/<slug:category_slug>/',
         views.CategoryListView.as_view(),
         name='category_posts'
     ),
+    path(
+        'category/<slug:category_slug>/rss/',
+        feeds.CategoryPostFeed(),
+        name='category_rss'
+    ),
+    path(
+        'category/<slug:category_slug>/atom/',
+        feeds.AtomCategoryPostFeed(),
+        name='category_atom'
+    ),
     path(
         'posts/create/',
         views.PostCreateView.as_view(),
@@ -45,6 +70,16 @@ urlpatterns = [
         views.ProfileListView.as_view(),
         name='profile'
     ),
+    path(
+        'profile/<str:username>/rss/',
+        feeds.AuthorPostFeed(),
+        name='profile_rss'
+    ),
+    path(
+        'profile/<str:username>/atom/',
+        feeds.AtomAuthorPostFeed(),
+        name='profile_atom'
+    ),
     path(
         'posts/<int:post_id>/comment/',
         views.CommentCreateView.as_view(),
@@ -60,4 +95,24 @@ urlpatterns = [
         views.CommentDeleteView.as_view(),
         name='delete_comment'
     ),
+    path(
+        'sitemap.xml',
+        sitemaps.sitemap_index,
+        name='sitemap'
+    ),
+    path(
+        'sitemap-categories.xml',
+        sitemaps.categories_sitemap,
+        name='sitemap_categories'
+    ),
+    path(
+        'sitemap-posts-<int:chunk>.xml',
+        sitemaps.posts_sitemap,
+        name='sitemap_posts'
+    ),
+    path(
+        'sitemap-profiles-<int:chunk>.xml',
+        sitemaps.profiles_sitemap,
+        name='sitemap_profiles'
+    ),
 ]
@@ -1,17 +1,26 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db.models import Q
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.views.generic import (
     CreateView, DeleteView, DetailView, ListView, UpdateView
 )
 
-from blogicum.constants import POSTS_PER_PAGE
+from blogicum.constants import COMMENTS_PER_PAGE
+from .cache import (
+    category_feed, index_feed, profile_feed, profile_header
+)
 from .forms import CommentForm, UserForm
+from .managers import FEED_RELATED
 from .models import Category, Comment, Post
-from .mixins import PostMixin, AuthorPermissionMixin, CommentMixin
+from .mixins import (
+    PostMixin, AuthorPermissionMixin, CommentMixin, FeedMixin
+)
+from .paginators import CursorPaginator
 
 User = get_user_model()
 
@@ -22,47 +31,54 @@ class PostDetailView(DetailView):
     template_name = "blog/detail.html"
 
     def get_object(self):
+        posts = Post.objects.select_related(*FEED_RELATED)
         if self.request.user.is_anonymous:
-            post = get_object_or_404(
-                Post.published_posts, Q(pk=self.kwargs[self.pk_url_kwarg])
-            )
+            posts = posts.published()
         else:
-            post = get_object_or_404(
-                Post.objects, (
-                    (
-                        Q(author=self.request.user)
-                        | (
-                            Q(is_published=True)
-                            & Q(category__is_published=True)
-                            & Q(pub_date__lte=timezone.now())
-                        )
-                    )
-                    & Q(pk=self.kwargs[self.pk_url_kwarg])
-                ),
+            posts = posts.filter(
+                Q(author=self.request.user)
+                | (
+                    Q(is_published=True)
+                    & Q(category__is_published=True)
+                    & Q(pub_date__lte=timezone.now())
+                )
             )
-        return post
+        return get_object_or_404(posts, pk=self.kwargs[self.pk_url_kwarg])
+
+    def get_comments_page(self):
+        paginator = CursorPaginator(
+            self.object.comment.select_related("author"),
+            COMMENTS_PER_PAGE,
+            ordering=("created_at", "id"),
+        )
+        return paginator.page(self.request.GET.get("comments"))
 
     def get_context_data(self, **kwargs):
         return super().get_context_data(
             **kwargs,
             form=CommentForm(),
-            comments=(self.object.comment.select_related("author"))
+            comments=self.get_comments_page(),
         )
 
 
+class PostCommentsView(PostDetailView):
+    """A further page of comments, rendered as an HTML fragment."""
+
+    template_name = "includes/comment_list.html"
+
+
 class PostCreateView(
     LoginRequiredMixin, PostMixin, CreateView
 ):
 
     def form_valid(self, form):
-        post = form.save(commit=False)
-        post.author = User.objects.get(username=self.request.user)
-        post.save()
+        form.instance.author = self.request.user
         return super().form_valid(form)
 
     def get_success_url(self):
-        username = User.objects.get(username=self.request.user)
-        return reverse_lazy("blog:profile", kwargs={"username": username})
+        return reverse_lazy(
+            "blog:profile", kwargs={"username": self.request.user.username}
+        )
 
 
 class PostEditView(
@@ -83,49 +99,70 @@ class PostDeleteView(
     success_url = reverse_lazy("blog:index")
 
 
-class PostListView(ListView):
+class PostListView(FeedMixin, ListView):
     template_name = "blog/index.html"
-    queryset = Post.published_posts_comments.all()
-    paginate_by = POSTS_PER_PAGE
 
+    def get_queryset(self):
+        return Post.published_posts_comments.all()
+
+    def get_feed(self):
+        return index_feed()
 
-class CategoryListView(ListView):
-    paginate_by = POSTS_PER_PAGE
+
+class CategoryListView(FeedMixin, ListView):
     template_name = "blog/category.html"
     context_object_name = "category"
 
-    def get_queryset(self):
-        category = get_object_or_404(
+    @cached_property
+    def category(self):
+        return get_object_or_404(
             Category, slug=self.kwargs["category_slug"], is_published=True
         )
-        return Post.published_posts.filter(category=category)
+
+    def get_queryset(self):
+        return Post.published_posts_comments.filter(category=self.category)
+
+    def get_feed(self):
+        return category_feed(self.category.id)
 
 
-class ProfileListView(ListView):
-    paginate_by = POSTS_PER_PAGE
+class ProfileListView(FeedMixin, ListView):
     template_name = "blog/profile.html"
 
+    @cached_property
+    def author(self):
+        header = profile_header(self.kwargs["username"])
+        if header is None:
+            raise Http404
+        return header
+
+    @property
+    def is_own_profile(self):
+        return self.request.user.pk == self.author["id"]
+
     def get_queryset(self):
-        author = get_object_or_404(User, username=self.kwargs["username"])
+        author_id = self.author["id"]
         if self.request.user.is_anonymous:
-            post = Post.published_posts_comments.filter(author=author)
-        else:
-            post = Post.post_comments.filter(
-                Q(author=self.request.user)
-                | (
-                    Q(author=author)
-                    & Q(is_published=True)
-                    & Q(category__is_published=True)
-                    & Q(pub_date__lte=timezone.now())
-                )
-            )
-        return post
+            return Post.published_posts_comments.filter(author_id=author_id)
+        if self.is_own_profile:
+            return Post.post_comments.filter(author_id=author_id)
+        return Post.post_comments.filter(
+            author_id=author_id,
+            is_published=True,
+            category__is_published=True,
+            pub_date__lte=timezone.now(),
+        )
+
+    def get_feed(self):
+        return profile_feed(self.author["id"])
+
+    def get_feed_variant(self):
+        if self.request.user.is_anonymous:
+            return "public"
+        return "own" if self.is_own_profile else "members"
 
     def get_context_data(self, **kwargs):
-        return super().get_context_data(
-            **kwargs,
-            profile=get_object_or_404(User, username=self.kwargs["username"])
-        )
+        return super().get_context_data(**kwargs, profile=self.author)
 
 
 class ProfileEditView(
@@ -1,3 +1,19 @@
 MAX_LENGTH = 256
 MAX_TITLE_LENGTH = 20
 POSTS_PER_PAGE = 10
+COMMENTS_PER_PAGE = 50
+EXCERPT_WORDS = 10
+FEED_CACHE_TIMEOUT = 60 * 5
+PAGE_RANGE_ON_EACH_SIDE = 2
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+PROFILE_CACHE_TIMEOUT = 60 * 60 * 24
+RENDITION_WIDTHS = (320, 640, 1280)
+RENDITION_FORMATS = ("webp", "jpeg")
+IMAGE_MAX_SIZE = 2560
+IMAGE_JOB_MAX_ATTEMPTS = 3
+IMAGE_JOB_TIMEOUT = 60 * 10
+SEARCH_TITLE_WEIGHT = 3
+SEARCH_ADMIN_RANKED = 100
+SYNDICATION_ITEMS = 20
+SITEMAP_CHUNK_SIZE = 10000
+API_MAX_PAGE_SIZE = 100
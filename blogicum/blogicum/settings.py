@@ -22,10 +22,13 @@ INSTALLED_APPS = [
 
     'blog.apps.BlogConfig',
     'pages.apps.PagesConfig',
-    'core.apps.CoreConfig'
+    'core.apps.CoreConfig',
+    'search.apps.SearchConfig',
+    'api.apps.ApiConfig',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -79,6 +82,13 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum',
+    }
+}
+
 LANGUAGE_CODE = 'ru-RU'
 
 TIME_ZONE = 'UTC'
@@ -109,6 +119,47 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 MEDIA_URL = 'media/'
 
+SERVE_MEDIA = True
+
+MEDIA_MAX_AGE = 60 * 60
+
+IMAGE_UPLOAD_LIMITS = {
+    'MAX_BYTES': 10 * 1024 * 1024,
+    'MAX_PIXELS': 50_000_000,
+    'MAX_SIDE': 10000,
+    'FORMATS': ('JPEG', 'PNG', 'GIF', 'WEBP'),
+}
+
+SEARCH_BACKEND = 'auto'
+
 LOGIN_REDIRECT_URL = 'blog:index'
 
 LOGIN_URL = 'login'
+
+BLOG_CURSOR_PAGINATION = False
+
+REQUEST_METRICS = {
+    'ENABLED': True,
+    'THRESHOLDS': {
+        'blog:index': {'queries': 4, 'sql_ms': 50, 'total_ms': 200},
+        'blog:category_posts': {'queries': 5, 'sql_ms': 50, 'total_ms': 200},
+        'blog:profile': {'queries': 6, 'sql_ms': 50, 'total_ms': 200},
+        'blog:post_detail': {'queries': 4, 'sql_ms': 50, 'total_ms': 200},
+    },
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'blogicum.metrics': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+    },
+}
@@ -1,10 +1,13 @@
+import re
+
 from django.conf import settings
 from django.contrib import admin
-from django.conf.urls.static import static
-from django.urls import include, path, reverse_lazy
+from django.urls import include, path, re_path, reverse_lazy
 from django.contrib.auth.forms import UserCreationForm
 from django.views.generic.edit import CreateView
 
+from core.media import serve_media
+
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.custom_500'
 
@@ -17,6 +20,14 @@ urlpatterns = [
         'admin/',
         admin.site.urls
     ),
+    path(
+        'api/v1/',
+        include('api.urls', namespace='api')
+    ),
+    path(
+        'search/',
+        include('search.urls', namespace='search')
+    ),
     path(
         '',
         include('blog.urls', namespace='blog')
@@ -34,4 +45,15 @@ urlpatterns = [
         ),
         name='registration',
     ),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
+
+if settings.SERVE_MEDIA:
+    urlpatterns.append(
+        re_path(
+            r'^{}(?P<path>.+)$'.format(
+                re.escape(settings.MEDIA_URL.lstrip('/'))
+            ),
+            serve_media,
+            name='media',
+        )
+    )
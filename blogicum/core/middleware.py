@@ -0,0 +1,94 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger("blogicum.metrics")
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.render_started = None
+        self.render_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_time += time.perf_counter() - started
+
+    def start_render(self):
+        self.render_started = time.perf_counter()
+
+    def finish_render(self, response):
+        self.render_time = time.perf_counter() - self.render_started
+
+    def as_dict(self, request, response):
+        match = request.resolver_match
+        return {
+            "view": match.view_name if match else None,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": self.queries,
+            "sql_ms": round(self.sql_time * 1000, 2),
+            "template_ms": round(self.render_time * 1000, 2),
+            "total_ms": round(
+                (time.perf_counter() - self.started) * 1000, 2
+            ),
+        }
+
+
+class RequestMetricsMiddleware:
+    """Report per-request SQL and template costs.
+
+    Every response gets a ``Server-Timing`` header and a JSON record in the
+    ``blogicum.metrics`` log. Views listed in ``REQUEST_METRICS["THRESHOLDS"]``
+    are logged at WARNING level when any of their limits is exceeded; the
+    default LOGGING drops the INFO records of all other requests.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = getattr(settings, "REQUEST_METRICS", {})
+        if not config.get("ENABLED", True):
+            raise MiddlewareNotUsed
+        self.thresholds = config.get("THRESHOLDS", {})
+
+    def __call__(self, request):
+        metrics = request.metrics = RequestMetrics()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+            response = self.get_response(request)
+        record = metrics.as_dict(request, response)
+        response["Server-Timing"] = ", ".join((
+            f'sql;dur={record["sql_ms"]};desc="{record["queries"]} queries"',
+            f'tpl;dur={record["template_ms"]}',
+            f'total;dur={record["total_ms"]}',
+        ))
+        exceeded = [
+            name
+            for name, limit in self.thresholds.get(record["view"], {}).items()
+            if record.get(name, 0) > limit
+        ]
+        if exceeded:
+            record["exceeded"] = exceeded
+            logger.warning(json.dumps(record))
+        else:
+            logger.info(json.dumps(record))
+        return response
+
+    def process_template_response(self, request, response):
+        request.metrics.start_render()
+        response.add_post_render_callback(request.metrics.finish_render)
+        return response
@@ -0,0 +1,462 @@
+"""Search index backends: an SQLite FTS5 table or postings ranked in Python.
+
+``settings.SEARCH_BACKEND`` is "fts5", "python" or "auto".
+"""
+import math
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import (
+    Case, Count, Exists, F, IntegerField, OuterRef, Sum, Value, When
+)
+from django.db.models.expressions import RawSQL
+
+from blog.models import Comment, Post
+from blogicum.constants import SEARCH_TITLE_WEIGHT
+from .models import Document, IndexStatistics, Posting, Term
+from .text import terms
+
+FTS_TABLE = "search_fts"
+BM25_K1 = 1.2
+BM25_B = 0.75
+STATISTICS_BATCH_SIZE = 500
+
+
+def fts5_available(connection):
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return ("ENABLE_FTS5",) in cursor.fetchall()
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    name = getattr(settings, "SEARCH_BACKEND", "auto")
+    if name == "auto":
+        name = "fts5" if fts5_available(connection) else "python"
+    return {"fts5": Fts5Backend, "python": PythonBackend}[name]()
+
+
+def visible(queryset, post_id):
+    """Rows of ``queryset`` with id ``post_id``, for an EXISTS check."""
+    return queryset.order_by().filter(id=post_id).values("id")
+
+
+def stemmed(text):
+    return " ".join(terms(text))
+
+
+class Fts5Backend:
+    """FTS5 table of stems; rowid 2 * id for posts, 2 * id + 1 comments."""
+
+    @staticmethod
+    def post_rowid(post_id):
+        return 2 * post_id
+
+    @staticmethod
+    def comment_rowid(comment_id):
+        return 2 * comment_id + 1
+
+    def write(self, rows, fresh=False):
+        """Replace rows of ``(rowid, title, body, post_id)``."""
+        rows = list(rows)
+        with connection.cursor() as cursor:
+            if not fresh:
+                cursor.executemany(
+                    f"DELETE FROM {FTS_TABLE} WHERE rowid = %s",
+                    [(row[0],) for row in rows],
+                )
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, body, post_id) "
+                "VALUES (%s, %s, %s, %s)",
+                rows,
+            )
+
+    def delete(self, rowids):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s",
+                [(rowid,) for rowid in rowids],
+            )
+
+    def index_posts(self, posts, fresh=False):
+        self.write(
+            (
+                (
+                    self.post_rowid(post.id), stemmed(post.title),
+                    stemmed(post.text), post.id,
+                )
+                for post in posts
+            ),
+            fresh,
+        )
+
+    def index_comments(self, comments, fresh=False):
+        self.write(
+            (
+                (self.comment_rowid(comment.id), "", stemmed(comment.text),
+                 comment.post_id)
+                for comment in comments
+            ),
+            fresh,
+        )
+
+    def remove_post(self, post_id):
+        self.delete([self.post_rowid(post_id)])
+
+    def remove_comment(self, comment_id):
+        self.delete([self.comment_rowid(comment_id)])
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+
+    def update_statistics(self):
+        """Merge the index after a bulk load; FTS5 keeps its own counts."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')"
+            )
+
+    def rank(self, words, queryset):
+        return Fts5Ranking(words, queryset)
+
+
+class Fts5Ranking:
+    def __init__(self, words, queryset):
+        self.match = " ".join(
+            '"{}"'.format(word.replace('"', '""')) for word in words
+        )
+        self.visible_sql, self.visible_params = visible(
+            queryset, RawSQL("matches.post_id", ())
+        ).query.sql_with_params()
+
+    def matches_sql(self):
+        return (
+            "SELECT post_id, score FROM ("
+            f"SELECT post_id, MIN(rank) AS score FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s "
+            f"AND rank MATCH 'bm25({SEARCH_TITLE_WEIGHT}, 1.0)' "
+            f"GROUP BY post_id) AS matches "
+            f"WHERE EXISTS ({self.visible_sql})",
+            [self.match, *self.visible_params],
+        )
+
+    def post_ids(self):
+        """Subquery of every matching post id, visible or not."""
+        return RawSQL(
+            f"SELECT post_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+            (self.match,),
+        )
+
+    def count(self):
+        sql, params = self.matches_sql()
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM ({sql})", params)
+            return cursor.fetchone()[0]
+
+    def ids(self, offset, limit):
+        sql, params = self.matches_sql()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"{sql} ORDER BY score, post_id DESC LIMIT %s OFFSET %s",
+                [*params, limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PythonBackend:
+    """Postings in ordinary tables, ranked with BM25 in Python."""
+
+    def term_frequencies(self, title, body):
+        frequencies = defaultdict(int)
+        title_terms = terms(title)
+        for term in title_terms:
+            frequencies[term] += SEARCH_TITLE_WEIGHT
+        body_terms = terms(body)
+        for term in body_terms:
+            frequencies[term] += 1
+        return frequencies, len(title_terms) + len(body_terms)
+
+    def write(self, documents):
+        """Replace the postings of ``(post_id, comment_id, title, body)``."""
+        for post_id, comment_id, title, body in documents:
+            with transaction.atomic():
+                self.forget(Document.objects.filter(
+                    post_id=post_id, comment_id=comment_id
+                ))
+                frequencies, length = self.term_frequencies(title, body)
+                document = Document.objects.create(
+                    post_id=post_id, comment_id=comment_id, length=length
+                )
+                self.create_postings(document.id, frequencies)
+                self.count_terms(dict.fromkeys(frequencies, 1))
+                self.count_documents(1, length)
+
+    def create_postings(self, document_id, frequencies):
+        Posting.objects.bulk_create(
+            Posting(term=term, document_id=document_id, frequency=count)
+            for term, count in frequencies.items()
+        )
+
+    def bulk_write(self, documents):
+        """Add new documents; ``update_statistics`` recounts afterwards."""
+        last = Document.objects.order_by("-id").values_list("id", flat=True)
+        next_id = (last.first() or 0) + 1
+        batch, postings = [], []
+        for post_id, comment_id, title, body in documents:
+            frequencies, length = self.term_frequencies(title, body)
+            batch.append(Document(
+                id=next_id, post_id=post_id, comment_id=comment_id,
+                length=length,
+            ))
+            postings.extend(
+                Posting(term=term, document_id=next_id, frequency=count)
+                for term, count in frequencies.items()
+            )
+            next_id += 1
+        Document.objects.bulk_create(batch)
+        Posting.objects.bulk_create(postings, batch_size=5000)
+
+    def forget(self, documents):
+        """Delete ``documents`` and take them out of the statistics."""
+        removed = documents.aggregate(count=Count("id"), length=Sum("length"))
+        if not removed["count"]:
+            return
+        self.count_terms({
+            term: -count
+            for term, count in Posting.objects.filter(
+                document__in=documents
+            ).values("term").annotate(count=Count("id")).values_list(
+                "term", "count"
+            )
+        })
+        self.count_documents(-removed["count"], -removed["length"])
+        documents.delete()
+
+    def count_terms(self, deltas):
+        """Add ``deltas`` to the document frequencies of their terms."""
+        Term.objects.bulk_create(
+            (Term(term=term) for term, delta in deltas.items() if delta > 0),
+            batch_size=STATISTICS_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        by_delta = defaultdict(list)
+        for term, delta in deltas.items():
+            by_delta[delta].append(term)
+        # Most terms occur once per document: a handful of UPDATEs in all.
+        for delta, group in by_delta.items():
+            for start in range(0, len(group), STATISTICS_BATCH_SIZE):
+                Term.objects.filter(
+                    term__in=group[start:start + STATISTICS_BATCH_SIZE]
+                ).update(documents=F("documents") + delta)
+
+    def count_documents(self, documents, length):
+        updated = IndexStatistics.objects.filter(
+            pk=IndexStatistics.ROW
+        ).update(
+            documents=F("documents") + documents,
+            length=F("length") + length,
+        )
+        if not updated:
+            IndexStatistics.objects.create(
+                pk=IndexStatistics.ROW,
+                documents=max(documents, 0),
+                length=max(length, 0),
+            )
+
+    def update_statistics(self):
+        """Recount the statistics from the stored postings."""
+        with transaction.atomic():
+            Term.objects.all().delete()
+            rows = (
+                Posting.objects.order_by().values("term")
+                .annotate(documents=Count("id")).values_list(
+                    "term", "documents"
+                )
+            )
+            Term.objects.bulk_create(
+                (
+                    Term(term=term, documents=documents)
+                    for term, documents in rows.iterator()
+                ),
+                batch_size=STATISTICS_BATCH_SIZE,
+            )
+            totals = Document.objects.aggregate(
+                count=Count("id"), length=Sum("length")
+            )
+            IndexStatistics.objects.update_or_create(
+                pk=IndexStatistics.ROW,
+                defaults={
+                    "documents": totals["count"],
+                    "length": totals["length"] or 0,
+                },
+            )
+
+    def index_posts(self, posts, fresh=False):
+        write = self.bulk_write if fresh else self.write
+        write((post.id, None, post.title, post.text) for post in posts)
+
+    def index_comments(self, comments, fresh=False):
+        write = self.bulk_write if fresh else self.write
+        write(
+            (comment.post_id, comment.id, "", comment.text)
+            for comment in comments
+        )
+
+    def remove_post(self, post_id):
+        with transaction.atomic():
+            self.forget(Document.objects.filter(post_id=post_id))
+
+    def remove_comment(self, comment_id):
+        with transaction.atomic():
+            self.forget(Document.objects.filter(comment_id=comment_id))
+
+    def clear(self):
+        Posting.objects.all().delete()
+        Document.objects.all().delete()
+        Term.objects.all().delete()
+        IndexStatistics.objects.all().delete()
+
+    def rank(self, words, queryset):
+        return PythonRanking(words, queryset)
+
+
+class PythonRanking:
+    """Okapi BM25 in Python, the fallback for databases without FTS5."""
+
+    def __init__(self, words, queryset):
+        self.words = set(words)
+        self.queryset = queryset
+        self._ranked = None
+
+    @property
+    def ranked(self):
+        if self._ranked is None:
+            self._ranked = self.compute()
+        return self._ranked
+
+    def compute(self):
+        statistics = IndexStatistics.objects.filter(
+            pk=IndexStatistics.ROW
+        ).first()
+        if statistics is None or not statistics.documents:
+            return []
+        frequencies = dict(
+            Term.objects.filter(term__in=self.words, documents__gt=0)
+            .values_list("term", "documents")
+        )
+        if len(frequencies) < len(self.words):
+            return []
+        total = statistics.documents
+        average_length = statistics.length / total or 1
+        idf = {
+            term: math.log(1 + (total - documents + 0.5) / (documents + 0.5))
+            for term, documents in frequencies.items()
+        }
+        # Only documents holding every word are read into Python.
+        postings = Posting.objects.filter(
+            Exists(visible(self.queryset, OuterRef("document__post"))),
+            document__in=self.matching_documents().values("document"),
+            term__in=self.words,
+        ).values_list(
+            "document", "document__post", "document__length", "term",
+            "frequency",
+        )
+        documents = defaultdict(dict)
+        for document, post_id, length, term, frequency in postings:
+            documents[(document, post_id, length)][term] = frequency
+        scores = {}
+        for (_, post_id, length), found in documents.items():
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+            score = sum(
+                idf[term] * frequency * (BM25_K1 + 1) / (frequency + norm)
+                for term, frequency in found.items()
+            )
+            scores[post_id] = max(score, scores.get(post_id, 0))
+        return sorted(scores, key=lambda post_id: (-scores[post_id], -post_id))
+
+    def matching_documents(self):
+        return (
+            Posting.objects.filter(term__in=self.words)
+            .values("document", "document__post")
+            .annotate(found=Count("id"))
+            .filter(found=len(self.words))
+        )
+
+    def post_ids(self):
+        return self.matching_documents().values("document__post")
+
+    def count(self):
+        return len(self.ranked)
+
+    def ids(self, offset, limit):
+        return self.ranked[offset:offset + limit]
+
+
+class SearchResults:
+    """Posts matching a query, best first, sliceable like a queryset."""
+
+    def __init__(self, query, queryset):
+        self.query = query
+        self.queryset = queryset
+        words = list(dict.fromkeys(terms(query)))
+        self.ranking = get_backend().rank(words, queryset) if words else None
+
+    def count(self):
+        return self.ranking.count() if self.ranking else 0
+
+    def __len__(self):
+        return self.count()
+
+    def filter(self, ranked):
+        """Matching posts, ``search_rank`` giving the ``ranked`` best first."""
+        best = self.ranking.ids(0, ranked)
+        return self.queryset.filter(
+            id__in=self.ranking.post_ids()
+        ).annotate(
+            search_rank=Case(
+                *(
+                    When(id=post_id, then=Value(position))
+                    for position, post_id in enumerate(best)
+                ),
+                default=Value(len(best)),
+                output_field=IntegerField(),
+            )
+        )
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice) or key.step:
+            raise TypeError("SearchResults supports only simple slices.")
+        if self.ranking is None:
+            return []
+        offset = key.start or 0
+        limit = (key.stop - offset) if key.stop is not None else self.count()
+        ids = self.ranking.ids(offset, max(limit, 0))
+        posts = self.queryset.in_bulk(ids)
+        return [posts[post_id] for post_id in ids if post_id in posts]
+
+
+def rebuild(batch_size):
+    """Index every post and comment again, in id-ordered batches."""
+    backend = get_backend()
+    backend.clear()
+    batches = (
+        (Post.objects.only("id", "title", "text"), backend.index_posts),
+        (Comment.objects.only("id", "post_id", "text"),
+         backend.index_comments),
+    )
+    for rows, index in batches:
+        rows = rows.order_by("id")
+        last_id = 0
+        while True:
+            batch = list(rows.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            with transaction.atomic():
+                index(batch, fresh=True)
+            last_id = batch[-1].id
+    backend.update_statistics()
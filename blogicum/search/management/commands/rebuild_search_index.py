@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from search.backends import get_backend, rebuild
+
+
+class Command(BaseCommand):
+    help = "Заново строит поисковый индекс публикаций и комментариев."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Сколько записей индексировать одним запросом.",
+        )
+
+    def handle(self, *args, **options):
+        rebuild(options["batch_size"])
+        backend = type(get_backend()).__name__
+        self.stdout.write(
+            self.style.SUCCESS(f"Индекс перестроен ({backend}).")
+        )
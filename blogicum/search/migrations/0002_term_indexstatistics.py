@@ -0,0 +1,37 @@
+# Generated by Django 4.2.13 on 2026-10-18 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('documents', models.PositiveIntegerField(default=0, verbose_name='Документов')),
+                ('length', models.PositiveBigIntegerField(default=0, verbose_name='Слов во всех документах')),
+            ],
+            options={
+                'verbose_name': 'статистика индекса',
+                'verbose_name_plural': 'Статистика индекса',
+            },
+        ),
+        migrations.CreateModel(
+            name='Term',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, unique=True, verbose_name='Слово')),
+                ('documents', models.PositiveIntegerField(default=0, verbose_name='Документов')),
+            ],
+            options={
+                'verbose_name': 'слово индекса',
+                'verbose_name_plural': 'Слова индекса',
+            },
+        ),
+    ]
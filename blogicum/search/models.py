@@ -0,0 +1,101 @@
+from django.db import models
+
+from blog.models import Comment, Post
+from .text import MAX_WORD_LENGTH
+
+
+class Document(models.Model):
+    """A post or a comment as seen by the Python search backend."""
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="Публикация",
+    )
+    comment = models.OneToOneField(
+        Comment,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Комментарий",
+    )
+    length = models.PositiveIntegerField(
+        default=0, verbose_name="Количество слов"
+    )
+
+    class Meta:
+        verbose_name = "документ поиска"
+        verbose_name_plural = "Документы поиска"
+        indexes = (
+            models.Index(fields=("post",), name="search_document_post_idx"),
+        )
+
+    def __str__(self):
+        return f"{self.post_id}:{self.comment_id or ''}"
+
+
+class Posting(models.Model):
+    """How often a term occurs in a document, title words weighted up."""
+
+    term = models.CharField(
+        max_length=MAX_WORD_LENGTH, verbose_name="Слово"
+    )
+    document = models.ForeignKey(
+        Document,
+        on_delete=models.CASCADE,
+        related_name="postings",
+        verbose_name="Документ",
+    )
+    frequency = models.PositiveIntegerField(verbose_name="Частота")
+
+    class Meta:
+        verbose_name = "вхождение слова"
+        verbose_name_plural = "Вхождения слов"
+        indexes = (
+            models.Index(
+                fields=("term", "document"), name="search_posting_term_idx"
+            ),
+        )
+
+    def __str__(self):
+        return self.term
+
+
+class Term(models.Model):
+    """In how many documents a term occurs, kept up to date on indexing."""
+
+    term = models.CharField(
+        max_length=MAX_WORD_LENGTH, unique=True, verbose_name="Слово"
+    )
+    documents = models.PositiveIntegerField(
+        default=0, verbose_name="Документов"
+    )
+
+    class Meta:
+        verbose_name = "слово индекса"
+        verbose_name_plural = "Слова индекса"
+
+    def __str__(self):
+        return self.term
+
+
+class IndexStatistics(models.Model):
+    """Size of the whole index: one row, see ``IndexStatistics.ROW``."""
+
+    ROW = 1
+
+    documents = models.PositiveIntegerField(
+        default=0, verbose_name="Документов"
+    )
+    length = models.PositiveBigIntegerField(
+        default=0, verbose_name="Слов во всех документах"
+    )
+
+    class Meta:
+        verbose_name = "статистика индекса"
+        verbose_name_plural = "Статистика индекса"
+
+    def __str__(self):
+        return f"{self.documents} / {self.length}"
@@ -0,0 +1,31 @@
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+
+from blog.models import Comment, Post
+from .backends import get_backend
+
+INDEXED_POST_FIELDS = {"title", "text"}
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or INDEXED_POST_FIELDS & set(update_fields):
+        get_backend().index_posts([instance])
+
+
+@receiver(post_save, sender=Comment)
+def index_comment(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or "text" in update_fields:
+        get_backend().index_comments([instance])
+
+
+# Removed before the delete cascades to the index tables, so the Python
+# backend can still read the postings it has to subtract from statistics.
+@receiver(pre_delete, sender=Post)
+def remove_post(sender, instance, **kwargs):
+    get_backend().remove_post(instance.id)
+
+
+@receiver(pre_delete, sender=Comment)
+def remove_comment(sender, instance, **kwargs):
+    get_backend().remove_comment(instance.id)
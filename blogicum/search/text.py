@@ -0,0 +1,51 @@
+"""Turning text into index terms.
+
+Both the index and the queries go through ``terms``: words are lower-cased,
+ё is read as е and every word is reduced to its Snowball stem, so
+«публикации» and «публикацию» meet at «публикац». Cyrillic words use the
+Russian stemmer and Latin ones the English stemmer; other words are kept
+as they are. Snowball stemmers keep state between calls, so each thread
+gets its own.
+"""
+import re
+import threading
+from functools import lru_cache
+
+import snowballstemmer
+
+WORD = re.compile(r"\w+")
+CYRILLIC = re.compile(r"[а-я]")
+LATIN = re.compile(r"[a-z]")
+MAX_WORD_LENGTH = 64
+LOCAL = threading.local()
+
+
+def tokenize(text):
+    """Lower-cased words of ``text``, with ё read as е.
+
+    Single letters are dropped and very long words cut to MAX_WORD_LENGTH.
+    """
+    return [
+        word[:MAX_WORD_LENGTH]
+        for word in WORD.findall(text.lower().replace("ё", "е"))
+        if len(word) > 1
+    ]
+
+
+def stemmer(language):
+    if not hasattr(LOCAL, language):
+        setattr(LOCAL, language, snowballstemmer.stemmer(language))
+    return getattr(LOCAL, language)
+
+
+@lru_cache(maxsize=100_000)
+def stem(word):
+    if CYRILLIC.search(word):
+        return stemmer("russian").stemWord(word)
+    if LATIN.search(word):
+        return stemmer("english").stemWord(word)
+    return word
+
+
+def terms(text):
+    return [stem(word) for word in tokenize(text)]
@@ -0,0 +1,31 @@
+from urllib.parse import urlencode
+
+from django.views.generic import ListView
+
+from blog.mixins import FeedMixin
+from blog.models import Post
+from .backends import SearchResults
+
+
+class SearchView(FeedMixin, ListView):
+    """Published posts matching ``?q=``, best matches first."""
+
+    template_name = "search/results.html"
+
+    @property
+    def query(self):
+        return self.request.GET.get("q", "").strip()
+
+    def get_queryset(self):
+        return SearchResults(self.query, Post.published_posts_comments.all())
+
+    def uses_cursor_pagination(self):
+        return False
+
+    def get_context_data(self, **kwargs):
+        query = self.query
+        return super().get_context_data(
+            **kwargs,
+            q=query,
+            page_query=urlencode({"q": query}) + "&" if query else "",
+        )
@@ -109,6 +109,24 @@ def many_posts_with_published_locations(
     )
 
 
+@pytest.fixture
+def public_posts(
+    mixer: Mixer, user, published_location, published_category
+):
+    pub_dates = (
+        timezone.now() - timedelta(hours=hours)
+        for hours in range(1, N_PER_PAGE + 3)
+    )
+    return mixer.cycle(N_PER_PAGE + 2).blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        category=published_category,
+        location=published_location,
+        pub_date=pub_dates,
+    )
+
+
 @pytest.fixture
 def post_comment_context_form_item(
     user_client: Client, post_with_published_location
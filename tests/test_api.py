@@ -0,0 +1,138 @@
+from http import HTTPStatus
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def hidden_post(mixer, user):
+    return mixer.blend("blog.Post", author=user, is_published=False)
+
+
+def get_json(client, url, **params):
+    response = client.get(url, params)
+    assert response.status_code == HTTPStatus.OK, (url, response.content)
+    assert response["Content-Type"] == "application/json"
+    return response.json()
+
+
+def test_feed_walks_all_public_posts(client, public_posts, hidden_post):
+    seen = []
+    cursor = ""
+    while True:
+        data = get_json(client, "/api/v1/posts/", cursor=cursor, limit=5)
+        seen.extend(post["id"] for post in data["results"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    newest_first = sorted(public_posts, key=lambda post: post.pub_date)
+    assert seen == [post.id for post in reversed(newest_first)], (
+        "Убедитесь, что API отдаёт все опубликованные посты, новые первыми."
+    )
+    assert hidden_post.id not in seen
+
+
+def test_list_leaves_text_out_and_fields_narrow_it(client, public_posts):
+    post = get_json(client, "/api/v1/posts/")["results"][0]
+    assert "text" not in post, (
+        "Убедитесь, что списки постов по умолчанию не содержат текст."
+    )
+    assert post["author"] == public_posts[0].author.username
+    post = get_json(client, "/api/v1/posts/", fields="id,title")["results"][0]
+    assert set(post) == {"id", "title"}
+    response = client.get("/api/v1/posts/", {"fields": "id,password"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "password" in response.json()["detail"]
+
+
+def test_malformed_cursor_is_a_bad_request(client, public_posts):
+    response = client.get("/api/v1/posts/", {"cursor": "not-a-cursor"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST, (
+        "Убедитесь, что неверный курсор - ошибка запроса, а не 404."
+    )
+    assert response.json()["detail"]
+
+
+def test_category_and_profile_feeds(client, public_posts, mixer):
+    post = public_posts[0]
+    other = mixer.blend(
+        "blog.Post", author=mixer.blend("auth.User"), is_published=True,
+        category__is_published=True,
+    )
+    for url in (
+        f"/api/v1/categories/{post.category.slug}/posts/",
+        f"/api/v1/profiles/{post.author.username}/posts/",
+    ):
+        data = get_json(client, url, limit=20)
+        ids = [item["id"] for item in data["results"]]
+        assert ids == [item.id for item in public_posts], url
+        assert other.id not in ids
+    hidden = mixer.blend("blog.Category", is_published=False)
+    response = client.get(f"/api/v1/categories/{hidden.slug}/posts/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert client.get(
+        "/api/v1/profiles/nobody-here/posts/"
+    ).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_post_detail(client, public_posts, hidden_post):
+    post = public_posts[0]
+    data = get_json(client, f"/api/v1/posts/{post.id}/")
+    assert data["text"] == post.text
+    assert data["title"] == post.title
+    response = client.get(f"/api/v1/posts/{hidden_post.id}/")
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что API не отдаёт неопубликованные посты."
+    )
+
+
+def test_comments_page(client, public_posts, mixer, user):
+    post = public_posts[0]
+    comments = mixer.cycle(7).blend("blog.Comment", post=post, author=user)
+    first = get_json(client, f"/api/v1/posts/{post.id}/comments/", limit=4)
+    second = get_json(
+        client, f"/api/v1/posts/{post.id}/comments/",
+        limit=4, cursor=first["next_cursor"],
+    )
+    assert second["next_cursor"] is None
+    ids = [item["id"] for item in first["results"] + second["results"]]
+    assert ids == [comment.id for comment in comments]
+    assert set(first["results"][0]) == {"id", "text", "created_at", "author"}
+
+
+def test_unchanged_resources_are_not_modified(
+        client, public_posts, django_assert_num_queries
+):
+    post = public_posts[0]
+    urls = (
+        "/api/v1/posts/",
+        f"/api/v1/posts/{post.id}/",
+        f"/api/v1/posts/{post.id}/comments/",
+        f"/api/v1/profiles/{post.author.username}/posts/",
+    )
+    etags = {url: client.get(url)["ETag"] for url in urls}
+    for url, etag in etags.items():
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Убедитесь, что `{url}` отвечает 304 на актуальный ETag."
+        )
+    post.title = "Новый заголовок"
+    post.save()
+    for url, etag in etags.items():
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, url
+
+
+def test_edited_comment_is_served_again(client, public_posts, mixer, user):
+    comment = mixer.blend("blog.Comment", post=public_posts[0], author=user)
+    url = f"/api/v1/posts/{comment.post_id}/comments/"
+    etag = client.get(url)["ETag"]
+    comment.text = "Исправленный комментарий"
+    comment.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после правки комментария список отдаётся заново."
+    )
+    assert response.json()["results"][0]["text"] == comment.text
@@ -0,0 +1,178 @@
+from contextlib import contextmanager
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from blog.cache import feed_timeout
+from blogicum.constants import FEED_CACHE_TIMEOUT
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_content(client, url):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return response.content.decode("utf-8")
+
+
+def test_anonymous_feed_is_served_from_cache(
+        unlogged_client, post_with_published_location,
+        django_assert_num_queries
+):
+    post = post_with_published_location
+    assert post.title in get_content(unlogged_client, "/")
+    with django_assert_num_queries(0):
+        assert post.title in get_content(unlogged_client, "/")
+
+
+def unpublish_category(post):
+    post.category.is_published = False
+    post.category.save()
+
+
+def unpublish_location(post):
+    post.location.is_published = False
+    post.location.save()
+
+
+def unpublish_post(post):
+    post.is_published = False
+    post.save()
+
+
+def delete_post(post):
+    post.delete()
+
+
+@pytest.mark.parametrize(
+    "change",
+    (unpublish_category, unpublish_location, unpublish_post, delete_post),
+)
+def test_unpublishing_invalidates_cached_feeds(
+        unlogged_client, post_with_published_location, change
+):
+    post = post_with_published_location
+    urls = (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+    for url in urls:
+        assert post.title in get_content(unlogged_client, url)
+    change(post)
+    for url in urls:
+        response = unlogged_client.get(url)
+        assert post.title not in response.content.decode("utf-8"), (
+            "Убедитесь, что закешированная лента обновляется сразу после "
+            "снятия публикации, категории или локации с публикации."
+        )
+
+
+def test_new_comment_invalidates_cached_feed(
+        unlogged_client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    assert "Комментарии (0)" in get_content(unlogged_client, "/")
+    mixer.blend("blog.Comment", post=post)
+    assert "Комментарии (1)" in get_content(unlogged_client, "/")
+
+
+@contextmanager
+def frozen_time(moment):
+    with mock.patch("django.utils.timezone.now", return_value=moment), \
+            mock.patch("time.time", return_value=moment.timestamp()):
+        yield
+
+
+@pytest.fixture
+def scheduled_post(mixer, post_with_published_location):
+    post = post_with_published_location
+    return mixer.blend(
+        "blog.Post",
+        author=post.author,
+        category=post.category,
+        location=post.location,
+        pub_date=timezone.now() + timedelta(seconds=90),
+    )
+
+
+def test_feed_timeout_stops_at_next_publication(scheduled_post):
+    now = scheduled_post.pub_date - timedelta(seconds=90)
+    with frozen_time(now):
+        assert feed_timeout() == 90, (
+            "Убедитесь, что время жизни кеша ленты не превышает времени до "
+            "ближайшей отложенной публикации."
+        )
+    with frozen_time(now - timedelta(days=1)):
+        assert feed_timeout() == FEED_CACHE_TIMEOUT
+
+
+def test_feed_timeout_without_scheduled_posts(post_with_published_location):
+    assert feed_timeout() == FEED_CACHE_TIMEOUT
+
+
+def test_scheduled_post_appears_in_cached_feed(
+        unlogged_client, scheduled_post
+):
+    now = scheduled_post.pub_date - timedelta(seconds=90)
+    with frozen_time(now):
+        assert scheduled_post.title not in get_content(unlogged_client, "/")
+    with frozen_time(now + timedelta(seconds=89)):
+        assert scheduled_post.title not in get_content(unlogged_client, "/")
+    with frozen_time(now + timedelta(seconds=90)):
+        assert scheduled_post.title in get_content(unlogged_client, "/"), (
+            "Убедитесь, что отложенная публикация появляется в "
+            "закешированной ленте сразу по наступлении даты публикации."
+        )
+
+
+@pytest.mark.parametrize(
+    ("item", "field"),
+    (("post", "title"), ("category", "title"), ("location", "name")),
+)
+def test_post_card_cache_follows_edits(
+        user_client, post_with_published_location, item, field
+):
+    post = post_with_published_location
+    edited = post if item == "post" else getattr(post, item)
+    assert "Новый заголовок" not in get_content(user_client, "/")
+    setattr(edited, field, "Новый заголовок")
+    edited.save()
+    assert "Новый заголовок" in get_content(user_client, "/"), (
+        "Убедитесь, что карточка публикации обновляется после изменения "
+        "публикации, её категории или местоположения."
+    )
+
+
+def test_profile_header_follows_user_edits(unlogged_client, user):
+    url = f"/profile/{user.username}/"
+    assert "Новое Имя" not in get_content(unlogged_client, url)
+    user.first_name, user.last_name = "Новое", "Имя"
+    user.save()
+    assert "Новое Имя" in get_content(unlogged_client, url), (
+        "Убедитесь, что страница профиля обновляется после изменения "
+        "данных пользователя."
+    )
+
+
+def test_author_rename_refreshes_cached_feeds(
+        unlogged_client, post_with_published_location
+):
+    author = post_with_published_location.author
+    old_username = author.username
+    assert f"@{old_username}" in get_content(unlogged_client, "/")
+    etag = unlogged_client.get("/api/v1/posts/")["ETag"]
+    author.username = "renamed_author"
+    author.save()
+    content = get_content(unlogged_client, "/")
+    assert "@renamed_author" in content, (
+        "Убедитесь, что лента показывает новое имя автора после "
+        "его изменения."
+    )
+    assert f"@{old_username}<" not in content
+    response = unlogged_client.get("/api/v1/posts/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["results"][0]["author"] == "renamed_author"
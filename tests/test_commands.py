@@ -0,0 +1,32 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_fill_excerpts_refreshes_cached_cards(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(excerpt="Устаревший анонс")
+    assert "Устаревший анонс" in client.get("/").content.decode("utf-8")
+    call_command("fill_excerpts")
+    content = client.get("/").content.decode("utf-8")
+    assert "Устаревший анонс" not in content, (
+        "Убедитесь, что после fill_excerpts лента показывает новые анонсы."
+    )
+    assert Post.make_excerpt(post.text) in content
+
+
+def test_recount_comments_repairs_counter(mixer, user):
+    posts = mixer.cycle(3).blend("blog.Post", author=user)
+    mixer.cycle(2).blend("blog.Comment", post=posts[0], author=user)
+    Post.objects.update(comment_count=7)
+    call_command("recount_comments", batch_size=2)
+    counts = dict(Post.objects.values_list("id", "comment_count"))
+    assert counts == {posts[0].id: 2, posts[1].id: 0, posts[2].id: 0}, (
+        "Убедитесь, что recount_comments восстанавливает счётчики "
+        "комментариев всех публикаций."
+    )
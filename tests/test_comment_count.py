@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def comment_count(post):
+    return Post.objects.values_list("comment_count", flat=True).get(pk=post.pk)
+
+
+@pytest.fixture
+def post(mixer, user):
+    return mixer.blend("blog.Post", author=user)
+
+
+def test_bulk_and_cascade_deletes_keep_comment_count(mixer, post):
+    commenter, other = mixer.cycle(2).blend("auth.User")
+    mixer.cycle(3).blend("blog.Comment", post=post, author=commenter)
+    mixer.cycle(2).blend("blog.Comment", post=post, author=other)
+    assert comment_count(post) == 5
+    commenter.delete()
+    assert comment_count(post) == 2, (
+        "Убедитесь, что при удалении пользователя счётчик комментариев "
+        "его публикаций уменьшается."
+    )
+    Comment.objects.filter(post=post).delete()
+    assert comment_count(post) == 0, (
+        "Убедитесь, что массовое удаление комментариев уменьшает счётчик."
+    )
+
+
+def test_edited_comment_is_counted_once(mixer, post, user):
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    comment.text = "Исправленный комментарий"
+    comment.save()
+    assert comment_count(post) == 1
+
+
+def delete_queries(post):
+    with CaptureQueriesContext(connection) as context:
+        post.delete()
+    return len(context.captured_queries)
+
+
+def test_deleting_post_skips_counter_of_its_comments(mixer, user):
+    few, many = mixer.cycle(2).blend("blog.Post", author=user)
+    mixer.blend("blog.Comment", post=few, author=user)
+    mixer.cycle(6).blend("blog.Comment", post=many, author=user)
+    # Only the search index still removes the comments one by one.
+    assert delete_queries(many) - delete_queries(few) <= 5, (
+        "Убедитесь, что при удалении публикации счётчик не обновляется "
+        "для каждого её комментария."
+    )
+    comment = mixer.blend("blog.Comment", author=user)
+    comment.delete()
+    assert comment_count(comment.post) == 0
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+from django.utils.http import http_date
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def public_post(public_posts):
+    return public_posts[0]
+
+
+def feed_urls(post):
+    return (
+        "/feeds/rss/",
+        "/feeds/atom/",
+        f"/category/{post.category.slug}/rss/",
+        f"/category/{post.category.slug}/atom/",
+        f"/profile/{post.author.username}/rss/",
+        f"/profile/{post.author.username}/atom/",
+    )
+
+
+def test_feeds_list_public_posts(client, public_post, mixer):
+    hidden = mixer.blend(
+        "blog.Post",
+        author=public_post.author,
+        category=public_post.category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    for url in feed_urls(public_post):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, url
+        content = response.content.decode("utf-8")
+        assert public_post.title in content, (
+            f"Убедитесь, что лента `{url}` содержит опубликованные посты."
+        )
+        assert hidden.title not in content, (
+            f"Убедитесь, что лента `{url}` не содержит отложенные посты."
+        )
+    assert "atom" in client.get("/feeds/atom/")["Content-Type"]
+
+
+def test_feeds_of_hidden_category_and_unknown_author(client, mixer):
+    category = mixer.blend("blog.Category", is_published=False)
+    assert client.get(
+        f"/category/{category.slug}/rss/"
+    ).status_code == HTTPStatus.NOT_FOUND
+    assert client.get(
+        "/profile/nobody-here/atom/"
+    ).status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.parametrize("index", range(6))
+def test_unchanged_feed_is_not_modified(
+        client, public_post, index, django_assert_max_num_queries
+):
+    url = feed_urls(public_post)[index]
+    response = client.get(url)
+    etag = response["ETag"]
+    assert response["Last-Modified"] == http_date(
+        public_post.pub_date.timestamp()
+    ), "Убедитесь, что Last-Modified ленты - дата новейшей публикации."
+    # Resolving the category of a category feed is the only query left.
+    with django_assert_max_num_queries(1):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что неизменившаяся лента отдаётся с кодом 304."
+    )
+    response = client.get(
+        url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    public_post.title = "Новый заголовок"
+    public_post.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после изменения поста лента отдаётся заново."
+    )
+    assert "Новый заголовок" in response.content.decode("utf-8")
+
+
+def test_scheduled_post_reaches_polling_clients(client, public_post, mixer):
+    scheduled = mixer.blend(
+        "blog.Post",
+        author=public_post.author,
+        category=public_post.category,
+        location=public_post.location,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+    response = client.get("/feeds/rss/")
+    assert scheduled.title not in response.content.decode("utf-8")
+    later = timezone.now() + timedelta(hours=2)
+    with mock.patch("django.utils.timezone.now", return_value=later), \
+            mock.patch("time.time", return_value=later.timestamp()):
+        response = client.get(
+            "/feeds/rss/",
+            HTTP_IF_NONE_MATCH=response["ETag"],
+            HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+        )
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что лента обновляется, когда выходит отложенный пост."
+    )
+    assert scheduled.title in response.content.decode("utf-8")
@@ -0,0 +1,226 @@
+import struct
+import zlib
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import RequestFactory
+from PIL import Image
+
+from blog.images import rendition_widths
+from blog.jobs import drain
+from blog.models import ImageJob, Post
+from blog.uploads import ImageUploadHandler
+from blogicum.constants import RENDITION_WIDTHS
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_renditions_never_upscale():
+    assert rendition_widths(100) == [100]
+    assert rendition_widths(10000) == list(RENDITION_WIDTHS)
+    assert max(rendition_widths(RENDITION_WIDTHS[0] + 1)) == (
+        RENDITION_WIDTHS[0] + 1
+    )
+
+
+def test_renditions_are_made_by_worker(post_with_published_location):
+    post = post_with_published_location
+    assert not post.renditions, (
+        "Убедитесь, что фото публикации обрабатывается не во время "
+        "сохранения публикации, а в фоне."
+    )
+    assert drain() == 1
+    post.refresh_from_db()
+    storage = post.image.storage
+    formats = {image["format"] for image in post.renditions["images"]}
+    assert post.renditions["source"] == post.image.name
+    assert formats == {"webp", "jpeg"}, (
+        "Убедитесь, что для фото публикации создаются копии в форматах "
+        "WebP и JPEG."
+    )
+    assert all(
+        storage.exists(image["name"]) for image in post.renditions["images"]
+    )
+
+
+def test_feed_uses_renditions(user_client, post_with_published_location):
+    drain()
+    response = user_client.get("/")
+    assert response.status_code == HTTPStatus.OK
+    content = response.content.decode("utf-8")
+    assert 'type="image/webp"' in content, (
+        "Убедитесь, что в карточке публикации используются уменьшенные "
+        "копии фото."
+    )
+    assert content.count("<img class=") == 1
+
+
+def test_replaced_image_is_shown_before_processing(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    drain()
+    post.refresh_from_db()
+    old_names = [image["name"] for image in post.renditions["images"]]
+    post.image = SimpleUploadedFile("new.jpg", image_bytes())
+    post.save()
+    for url in ("/", f"/posts/{post.id}/"):
+        content = client.get(url).content.decode("utf-8")
+        assert not any(name in content for name in old_names), (
+            "Убедитесь, что после замены фото публикации старые копии "
+            "больше не показываются."
+        )
+        assert f'src="{post.image.url}"' in content
+
+
+def test_make_renditions_backfills_missing(post_with_published_location):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(renditions={})
+    call_command("make_renditions")
+    post.refresh_from_db()
+    assert post.renditions["source"] == post.image.name, (
+        "Убедитесь, что команда make_renditions создаёт недостающие копии "
+        "фото."
+    )
+
+
+def test_backfilled_renditions_reach_cached_feed(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(renditions={})
+    assert 'type="image/webp"' not in client.get("/").content.decode("utf-8")
+    call_command("make_renditions")
+    assert 'type="image/webp"' in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что после создания копий фото кэш ленты сбрасывается."
+    )
+
+
+def test_worker_strips_exif(mixer, post_with_published_location):
+    post = post_with_published_location
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    buffer = BytesIO()
+    Image.new("RGB", (50, 50)).save(buffer, "JPEG", exif=exif)
+    post.image = SimpleUploadedFile("exif.jpg", buffer.getvalue())
+    post.save()
+    drain()
+    post.refresh_from_db()
+    with post.image.open("rb"), Image.open(post.image) as image:
+        assert not image.getexif(), (
+            "Убедитесь, что при обработке фото из него удаляются EXIF-данные."
+        )
+
+
+def test_job_is_claimed_once(post_with_published_location):
+    job = ImageJob.objects.claim()
+    assert job is not None
+    assert job.status == ImageJob.Status.RUNNING
+    assert ImageJob.objects.claim() is None, (
+        "Убедитесь, что задача обработки фото достаётся только одному "
+        "обработчику."
+    )
+
+
+def test_saving_post_queues_image_once(post_with_published_location):
+    post = post_with_published_location
+    post.title = "Другой заголовок"
+    post.save()
+    assert ImageJob.objects.filter(post=post).count() == 1
+
+
+def png_header(width, height):
+    """Just the signature and IHDR chunk of a PNG, as a bomb would start."""
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + struct.pack(">I", len(ihdr)) + b"IHDR" + ihdr
+        + struct.pack(">I", zlib.crc32(b"IHDR" + ihdr))
+    )
+
+
+def image_bytes(size=(100, 100), image_format="JPEG"):
+    buffer = BytesIO()
+    Image.new("RGB", size).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def create_post(user_client, published_category, published_location):
+    def create(name, content):
+        return user_client.post("/posts/create/", {
+            "title": "Заголовок",
+            "text": "Текст",
+            "pub_date": "2020-01-01T00:00",
+            "category": published_category.id,
+            "location": published_location.id,
+            "image": SimpleUploadedFile(name, content),
+        })
+    return create
+
+
+@pytest.mark.parametrize(
+    ("limits", "content"),
+    (
+        ({"MAX_BYTES": 100}, image_bytes()),
+        ({"MAX_SIDE": 50}, image_bytes()),
+        ({"MAX_PIXELS": 5000}, image_bytes()),
+        ({}, png_header(100000, 100000) + b"\0" * 1024),
+        ({}, image_bytes(image_format="BMP")),
+        ({}, b"not an image" * 100),
+    ),
+    ids=(
+        "bytes", "side", "pixels", "bomb-header", "format", "not-an-image"
+    ),
+)
+def test_upload_limits_reject_hostile_images(
+        settings, create_post, limits, content
+):
+    settings.IMAGE_UPLOAD_LIMITS = {**settings.IMAGE_UPLOAD_LIMITS, **limits}
+    response = create_post("hostile.jpg", content)
+    assert response.status_code == HTTPStatus.OK
+    assert response.context["form"].errors.get("image"), (
+        "Убедитесь, что загрузка изображения, превышающего ограничения "
+        "IMAGE_UPLOAD_LIMITS, отклоняется с ошибкой в форме."
+    )
+    assert not Post.objects.exists()
+
+
+def test_upload_within_limits_is_accepted(create_post):
+    response = create_post("photo.jpg", image_bytes())
+    assert response.status_code == HTTPStatus.FOUND
+    assert Post.objects.count() == 1
+
+
+def test_handler_stops_storing_oversized_upload(settings):
+    settings.IMAGE_UPLOAD_LIMITS = {
+        **settings.IMAGE_UPLOAD_LIMITS, "MAX_BYTES": 1024
+    }
+    handler = ImageUploadHandler()
+    handler.new_file("image", "big.jpg", "image/jpeg", None)
+    content = image_bytes() + b"\0" * 4096
+    chunks = [content[i:i + 512] for i in range(0, len(content), 512)]
+    passed = [handler.receive_data_chunk(chunk, 0) for chunk in chunks]
+    assert all(chunk is None for chunk in passed[2:]), (
+        "Убедитесь, что данные слишком большого файла не передаются "
+        "дальше, как только превышен допустимый размер."
+    )
+    assert handler.file_complete(len(content)).rejection
+
+
+def test_other_uploads_skip_image_limits(settings):
+    settings.IMAGE_UPLOAD_LIMITS = {
+        **settings.IMAGE_UPLOAD_LIMITS, "MAX_BYTES": 16
+    }
+    content = b"plain text, not an image"
+    request = RequestFactory().post(
+        "/", {"file": SimpleUploadedFile("notes.txt", content)}
+    )
+    upload = request.FILES["file"]
+    assert not hasattr(upload, "rejection") and upload.read() == content, (
+        "Убедитесь, что ограничения на фото применяются только к формам "
+        "публикаций, а не ко всем загрузкам на сайте."
+    )
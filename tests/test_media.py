@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    (tmp_path / "post_images").mkdir()
+    (tmp_path / "post_images" / "photo.jpg").write_bytes(CONTENT)
+    (tmp_path / "post_images" / "photo.320w.0123456789ab.webp").write_bytes(
+        CONTENT
+    )
+    return "/media/post_images/photo.jpg"
+
+
+def body(response):
+    return response.getvalue()
+
+
+def test_media_has_validators(client, media):
+    response = client.get(media)
+    assert response.status_code == HTTPStatus.OK
+    assert body(response) == CONTENT
+    assert response["ETag"].startswith('"'), (
+        "Убедитесь, что медиафайлы отдаются с сильным ETag."
+    )
+    assert response["Last-Modified"]
+    assert response["Accept-Ranges"] == "bytes"
+    assert "immutable" not in response["Cache-Control"]
+
+
+def test_hashed_renditions_are_immutable(client, media):
+    response = client.get("/media/post_images/photo.320w.0123456789ab.webp")
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что файлы с хешем содержимого в имени кешируются "
+        "браузером навсегда."
+    )
+
+
+@pytest.mark.parametrize(
+    "header", ("HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE")
+)
+def test_conditional_get_returns_not_modified(client, media, header):
+    first = client.get(media)
+    validator = first["ETag" if "MATCH" in header else "Last-Modified"]
+    response = client.get(media, **{header: validator})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что на условный запрос неизменившегося медиафайла "
+        "возвращается ответ 304."
+    )
+    assert response["ETag"] == first["ETag"]
+
+
+@pytest.mark.parametrize(
+    ("header", "expected", "content_range"),
+    (
+        ("bytes=2-5", CONTENT[2:6], "bytes 2-5/1024"),
+        ("bytes=1000-", CONTENT[1000:], "bytes 1000-1023/1024"),
+        ("bytes=-4", CONTENT[-4:], "bytes 1020-1023/1024"),
+        ("bytes=1000-5000", CONTENT[1000:], "bytes 1000-1023/1024"),
+    ),
+)
+def test_range_requests(client, media, header, expected, content_range):
+    response = client.get(media, HTTP_RANGE=header)
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT, (
+        "Убедитесь, что медиафайлы поддерживают запросы диапазонов байтов."
+    )
+    assert body(response) == expected
+    assert response["Content-Range"] == content_range
+    assert response["Content-Length"] == str(len(expected))
+
+
+def test_unsatisfiable_range(client, media):
+    response = client.get(media, HTTP_RANGE="bytes=5000-")
+    assert response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    assert response["Content-Range"] == "bytes */1024"
+
+
+def test_stale_if_range_sends_whole_file(client, media):
+    response = client.get(
+        media, HTTP_RANGE="bytes=2-5", HTTP_IF_RANGE='"stale"'
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert body(response) == CONTENT
+
+
+@pytest.mark.parametrize(
+    "path", ("/media/post_images/missing.jpg", "/media/../manage.py",
+             "/media/post_images/")
+)
+def test_missing_media_is_not_found(client, media, path):
+    assert client.get(path).status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,34 @@
+import json
+import logging
+import re
+
+import pytest
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_server_timing_header(user_client, post_with_published_location):
+    response = user_client.get(f"/posts/{post_with_published_location.id}/")
+    assert re.fullmatch(
+        r'sql;dur=[\d.]+;desc="\d+ queries", tpl;dur=[\d.]+, '
+        r"total;dur=[\d.]+",
+        response["Server-Timing"],
+    ), "Убедитесь, что ответ содержит заголовок `Server-Timing`."
+
+
+def test_threshold_regression_is_logged(
+        client, caplog, post_with_published_location
+):
+    metrics = {
+        "ENABLED": True,
+        "THRESHOLDS": {"blog:index": {"queries": 0}},
+    }
+    with override_settings(REQUEST_METRICS=metrics), \
+            caplog.at_level(logging.INFO, logger="blogicum.metrics"):
+        client.get("/")
+    record = json.loads(caplog.records[-1].getMessage())
+    assert caplog.records[-1].levelno == logging.WARNING
+    assert record["view"] == "blog:index"
+    assert record["exceeded"] == ["queries"]
+    assert record["template_ms"] > 0
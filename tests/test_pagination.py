@@ -0,0 +1,82 @@
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_page(client, url, cursor):
+    response = client.get(url, {"cursor": cursor})
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что страница ленты с курсором загружается без ошибок."
+    )
+    return response.context["page_obj"]
+
+
+def test_cursor_pagination_walks_feed(
+        user_client, many_posts_with_published_locations
+):
+    expected_ids = [
+        post.id for post in sorted(
+            many_posts_with_published_locations,
+            key=lambda post: (post.pub_date, post.id),
+            reverse=True,
+        )
+    ]
+    pages = [get_page(user_client, "/", "")]
+    while pages[-1].has_next():
+        pages.append(get_page(user_client, "/", pages[-1].next_cursor))
+    assert [post.id for page in pages for post in page] == expected_ids, (
+        "Убедитесь, что при постраничной навигации по курсору каждая "
+        "публикация выводится ровно один раз и в порядке убывания даты."
+    )
+    assert all(len(page) <= N_PER_PAGE for page in pages)
+
+    previous = get_page(user_client, "/", pages[-1].previous_cursor)
+    assert [post.id for post in previous] == [post.id for post in pages[-2]], (
+        "Убедитесь, что ссылка на предыдущую страницу курсорной пагинации "
+        "возвращает предыдущую страницу."
+    )
+
+
+def test_cursor_pagination_rejects_broken_cursor(user_client):
+    response = user_client.get("/", {"cursor": "not-a-cursor"})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.fixture
+def many_comments(mixer, post_with_published_location):
+    with mock.patch("blog.views.COMMENTS_PER_PAGE", N_PER_PAGE):
+        yield mixer.cycle(N_PER_PAGE * 2 + 1).blend(
+            "blog.Comment", post=post_with_published_location
+        )
+
+
+def test_comments_are_paginated(user_client, many_comments):
+    post_id = many_comments[0].post_id
+    response = user_client.get(f"/posts/{post_id}/")
+    assert response.status_code == HTTPStatus.OK
+    pages = [response.context["comments"]]
+    assert len(pages[0]) == N_PER_PAGE, (
+        "Убедитесь, что на странице публикации выводится ограниченное "
+        "количество комментариев."
+    )
+    while pages[-1].has_next():
+        response = user_client.get(
+            f"/posts/{post_id}/comments/",
+            {"comments": pages[-1].next_cursor},
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            "Убедитесь, что следующие страницы комментариев загружаются "
+            "без ошибок."
+        )
+        pages.append(response.context["comments"])
+    assert [comment.id for page in pages for comment in page] == [
+        comment.id for comment in many_comments
+    ], (
+        "Убедитесь, что при постраничной загрузке каждый комментарий "
+        "выводится ровно один раз и в порядке добавления."
+    )
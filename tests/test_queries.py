@@ -0,0 +1,174 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    return len(context.captured_queries)
+
+
+def feed_urls(user, category):
+    return (
+        "/",
+        f"/category/{category.slug}/",
+        f"/profile/{user.username}/",
+    )
+
+
+@pytest.mark.parametrize("client_fixture", ("unlogged_client", "user_client"))
+def test_feed_query_count_does_not_depend_on_page_size(
+        request, client_fixture, mixer, user, published_category,
+        published_locations
+):
+    client = request.getfixturevalue(client_fixture)
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_locations[0],
+    )
+    single_post_counts = [
+        count_queries(client, url)
+        for url in feed_urls(user, published_category)
+    ]
+    mixer.cycle(N_PER_PAGE).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=mixer.sequence(*published_locations),
+    )
+    cache.clear()
+    full_page_counts = [
+        count_queries(client, url)
+        for url in feed_urls(user, published_category)
+    ]
+    assert single_post_counts == full_page_counts, (
+        "Убедитесь, что количество запросов к базе данных на страницах "
+        "ленты не зависит от количества публикаций на странице."
+    )
+
+
+def test_feed_count_is_cached(
+        unlogged_client, many_posts_with_published_locations
+):
+    first_hit = count_queries(unlogged_client, "/")
+    second_hit = count_queries(unlogged_client, "/")
+    assert second_hit < first_hit, (
+        "Убедитесь, что общее количество публикаций в ленте кешируется "
+        "между запросами."
+    )
+    many_posts_with_published_locations[0].save()
+    assert count_queries(unlogged_client, "/") == first_hit, (
+        "Убедитесь, что кеш количества публикаций сбрасывается при "
+        "изменении публикации."
+    )
+
+
+def test_feed_does_not_load_post_bodies(
+        user_client, user, published_category, post_with_published_location
+):
+    for url in feed_urls(user, published_category):
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(url)
+        assert post_with_published_location.excerpt in (
+            response.content.decode("utf-8")
+        )
+        assert not any(
+            '"blog_post"."text"' in query["sql"]
+            for query in context.captured_queries
+        ), (
+            "Убедитесь, что страницы ленты не загружают полный текст "
+            "публикаций."
+        )
+
+
+@pytest.mark.parametrize(
+    ("client_fixture", "budget"),
+    (("unlogged_client", 2), ("user_client", 4)),
+)
+def test_post_detail_query_budget(
+        request, client_fixture, budget, mixer, post_with_published_location
+):
+    client = request.getfixturevalue(client_fixture)
+    post = post_with_published_location
+    mixer.cycle(N_PER_PAGE).blend("blog.Comment", post=post)
+    assert count_queries(client, f"/posts/{post.id}/") <= budget, (
+        "Убедитесь, что страница публикации загружает публикацию вместе с "
+        "автором, категорией и местоположением одним запросом, а первую "
+        "страницу комментариев - ещё одним."
+    )
+
+
+@pytest.mark.parametrize("action", ("edit", "delete"))
+def test_post_edit_pages_load_post_once(
+        user_client, post_with_published_location, action
+):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as context:
+        response = user_client.get(f"/posts/{post.id}/{action}/")
+    assert response.status_code == HTTPStatus.OK
+    post_queries = [
+        query for query in context.captured_queries
+        if 'FROM "blog_post"' in query["sql"]
+    ]
+    assert len(post_queries) == 1, (
+        "Убедитесь, что страницы редактирования и удаления публикации "
+        "загружают публикацию из базы данных один раз."
+    )
+
+
+def test_post_creation_is_a_single_insert(
+        user_client, user, published_category, published_location
+):
+    with CaptureQueriesContext(connection) as context:
+        response = user_client.post("/posts/create/", {
+            "title": "Заголовок",
+            "text": "Текст",
+            "pub_date": "2020-01-01T00:00",
+            "category": published_category.id,
+            "location": published_location.id,
+        })
+    assert response.status_code == HTTPStatus.FOUND
+    post_writes = [
+        query["sql"] for query in context.captured_queries
+        if query["sql"].startswith(('INSERT INTO "blog_post"',
+                                    'UPDATE "blog_post"'))
+    ]
+    user_reads = [
+        query["sql"] for query in context.captured_queries
+        if 'FROM "auth_user"' in query["sql"]
+    ]
+    assert len(post_writes) == 1, (
+        "Убедитесь, что при создании публикации она сохраняется в базу "
+        "данных одним запросом."
+    )
+    assert len(user_reads) == 1, (
+        "Убедитесь, что при создании публикации автор не загружается из "
+        "базы данных повторно."
+    )
+
+
+def test_profile_author_is_cached(user_client, another_user):
+    url = f"/profile/{another_user.username}/"
+    count_queries(user_client, url)
+    with CaptureQueriesContext(connection) as context:
+        user_client.get(url)
+    assert not any(
+        '"auth_user"."username" =' in query["sql"]
+        for query in context.captured_queries
+    ), (
+        "Убедитесь, что данные автора на странице профиля кешируются "
+        "между запросами."
+    )
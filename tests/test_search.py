@@ -0,0 +1,204 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.models import Post
+from search.backends import PythonBackend, SearchResults, get_backend
+from search.models import IndexStatistics, Term
+from search.text import terms
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(params=("fts5", "python"))
+def backend(request):
+    with override_settings(SEARCH_BACKEND=request.param):
+        get_backend.cache_clear()
+        yield request.param
+    get_backend.cache_clear()
+
+
+@pytest.fixture
+def published(mixer, user, backend):
+    def blend(**kwargs):
+        fields = {
+            "author": user,
+            "is_published": True,
+            "category__is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+            **kwargs,
+        }
+        return mixer.blend("blog.Post", **fields)
+    return blend
+
+
+def search(query):
+    results = SearchResults(query, Post.published_posts_comments.all())
+    return [post.id for post in results[:100]]
+
+
+def test_search_finds_posts_by_every_word(published):
+    match = published(title="Зимний поход", text="Шли по льду озера")
+    published(title="Летний поход", text="Купались в озере")
+    assert search("поход льду") == [match.id], (
+        "Убедитесь, что поиск находит только публикации, где есть все "
+        "слова запроса."
+    )
+    assert search("ЗИМНИЙ") == [match.id], (
+        "Убедитесь, что поиск не зависит от регистра."
+    )
+    assert search("ёлка") == search("елка") == []
+
+
+def test_inflected_forms_match(published):
+    post = published(title="Публикации о морях", text="Мы писали о море")
+    assert search("публикация") == [post.id], (
+        "Убедитесь, что поиск находит другие формы слова."
+    )
+    assert search("морской") == []
+    assert search("моря писать") == [post.id]
+
+
+def test_terms_are_stems():
+    assert terms("Публикации публикацию ЁЛКИ runners") == [
+        "публикац", "публикац", "елк", "runner"
+    ]
+
+
+def test_title_matches_rank_first(published):
+    in_text = published(title="Заметки", text="Рассказ про маяк и море")
+    in_title = published(title="Маяк", text="Рассказ про море")
+    assert search("маяк") == [in_title.id, in_text.id], (
+        "Убедитесь, что совпадение в заголовке ценится выше совпадения "
+        "в тексте."
+    )
+
+
+def test_admin_search_filters_in_the_database(
+        admin_client, published, monkeypatch
+):
+    monkeypatch.setattr("blog.admin.SEARCH_ADMIN_RANKED", 1)
+    in_text = published(title="Заметки", text="Рассказ про маяк и море")
+    in_title = published(title="Маяк", text="Рассказ про море")
+    old = published(title="Старое", text="Рассказ про старый маяк и море")
+    published(title="Озеро", text="Рассказ про лес")
+    response = admin_client.get("/admin/blog/post/", {"q": "маяк"})
+    assert response.status_code == HTTPStatus.OK
+    changelist = response.context["cl"]
+    ids = [post.id for post in changelist.result_list]
+    assert ids[0] == in_title.id and set(ids) == {
+        in_title.id, in_text.id, old.id
+    }, (
+        "Убедитесь, что поиск в админке находит все подходящие публикации, "
+        "лучшие первыми."
+    )
+    assert changelist.result_count == 3
+
+
+def test_search_respects_visibility(published, mixer, user):
+    visible = published(title="Видимый кактус", text="Текст")
+    hidden = (
+        published(title="Снятый кактус", text="Текст", is_published=False),
+        mixer.blend(
+            "blog.Post", author=user, title="Будущий кактус", text="Текст",
+            is_published=True, category__is_published=True,
+            pub_date=timezone.now() + timedelta(days=1),
+        ),
+        mixer.blend(
+            "blog.Post", author=user, title="Кактус в скрытой категории",
+            text="Текст", is_published=True, category__is_published=False,
+            pub_date=timezone.now() - timedelta(days=1),
+        ),
+    )
+    assert search("кактус") == [visible.id], (
+        "Убедитесь, что поиск не показывает снятые с публикации, "
+        "отложенные публикации и публикации скрытых категорий."
+    )
+    assert all(post.id not in search("кактус") for post in hidden)
+
+
+def test_index_follows_changes(published, mixer, user):
+    post = published(title="Старый заголовок", text="Текст")
+    post.title = "Новый заголовок"
+    post.save()
+    assert search("старый") == []
+    assert search("новый") == [post.id]
+
+    comment = mixer.blend(
+        "blog.Comment", post=post, author=user, text="Отличная черепаха"
+    )
+    assert search("черепаха") == [post.id], (
+        "Убедитесь, что поиск находит публикацию по тексту комментария."
+    )
+    comment.delete()
+    assert search("черепаха") == []
+
+    post.delete()
+    assert search("новый") == []
+
+
+def test_rebuild_restores_index(published):
+    post = published(title="Пересборка индекса", text="Текст")
+    get_backend().clear()
+    assert search("пересборка") == []
+    call_command("rebuild_search_index", batch_size=1, stdout=None)
+    assert search("пересборка") == [post.id]
+
+
+def test_search_page_paginates(client, published):
+    posts = [
+        published(title=f"Рецепт {number}", text="Пирог с яблоками")
+        for number in range(12)
+    ]
+    response = client.get("/search/", {"q": "пирог"})
+    assert response.status_code == HTTPStatus.OK
+    page = response.context["page_obj"]
+    assert response.context["paginator"].count == len(posts)
+    assert len(page.object_list) == 10
+    content = response.content.decode("utf-8")
+    assert "?q=%D0%BF%D0%B8%D1%80%D0%BE%D0%B3&amp;page=2" in content, (
+        "Убедитесь, что ссылки пагинации сохраняют поисковый запрос."
+    )
+    second = client.get("/search/", {"q": "пирог", "page": 2})
+    assert len(second.context["page_obj"].object_list) == 2
+    ids = {post.id for post in page.object_list} | {
+        post.id for post in second.context["page_obj"].object_list
+    }
+    assert ids == {post.id for post in posts}
+
+
+def test_empty_query_shows_form(client):
+    response = client.get("/search/")
+    assert response.status_code == HTTPStatus.OK
+    assert response.context["paginator"].count == 0
+
+
+def statistics():
+    return (
+        dict(Term.objects.filter(documents__gt=0).values_list(
+            "term", "documents"
+        )),
+        IndexStatistics.objects.values_list("documents", "length").get(),
+    )
+
+
+@pytest.mark.parametrize("backend", ("python",), indirect=True)
+def test_statistics_follow_changes(backend, mixer, user):
+    posts = mixer.cycle(3).blend("blog.Post", author=user)
+    comments = mixer.cycle(4).blend(
+        "blog.Comment", post=posts[0], author=user
+    )
+    posts[1].title = "Новый заголовок"
+    posts[1].save()
+    comments[1].delete()
+    posts[0].delete()
+    incremental = statistics()
+    PythonBackend().update_statistics()
+    assert incremental == statistics(), (
+        "Убедитесь, что статистика индекса обновляется вместе с ним."
+    )
+    assert incremental[1][0] == 2
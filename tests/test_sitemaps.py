@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+CHUNK_SIZE = 2
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr("blog.cache.SITEMAP_CHUNK_SIZE", CHUNK_SIZE)
+    monkeypatch.setattr("blog.sitemaps.SITEMAP_CHUNK_SIZE", CHUNK_SIZE)
+
+
+def get_xml(client, url):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, url
+    assert response["Content-Type"] == "application/xml"
+    return response.content.decode("utf-8")
+
+
+def post_chunk_url(post):
+    return f"/sitemap-posts-{post.id // CHUNK_SIZE}.xml"
+
+
+def test_sitemap_index_lists_chunks(client, small_chunks, public_posts):
+    content = get_xml(client, "/sitemap.xml")
+    assert "/sitemap-categories.xml" in content
+    for post in public_posts:
+        assert post_chunk_url(post) in content, (
+            "Убедитесь, что индекс карты сайта ссылается на каждую часть "
+            "карты публикаций."
+        )
+    author_chunk = public_posts[0].author_id // CHUNK_SIZE
+    assert f"/sitemap-profiles-{author_chunk}.xml" in content
+
+
+def test_post_sitemap_lists_public_posts_of_chunk(
+        client, small_chunks, public_posts, mixer
+):
+    post = public_posts[0]
+    hidden = mixer.blend(
+        "blog.Post", author=post.author, is_published=False
+    )
+    hidden_chunk = hidden.id // CHUNK_SIZE
+    content = get_xml(client, f"/sitemap-posts-{hidden_chunk}.xml")
+    assert f"/posts/{hidden.id}/<" not in content, (
+        "Убедитесь, что карта сайта не содержит скрытые публикации."
+    )
+    content = get_xml(client, post_chunk_url(post))
+    for other in public_posts:
+        listed = f"/posts/{other.id}/<" in content
+        assert listed == (other.id // CHUNK_SIZE == post.id // CHUNK_SIZE), (
+            "Убедитесь, что часть карты сайта содержит ровно публикации "
+            "своего диапазона id."
+        )
+    assert f"<lastmod>{post.updated_at.date().isoformat()}</lastmod>" in (
+        content
+    )
+
+
+def test_chunks_are_cached_until_their_posts_change(
+        client, small_chunks, public_posts, django_assert_num_queries
+):
+    first, last = public_posts[0], public_posts[-1]
+    assert first.id // CHUNK_SIZE != last.id // CHUNK_SIZE
+    get_xml(client, post_chunk_url(first))
+    get_xml(client, post_chunk_url(last))
+    with django_assert_num_queries(0):
+        get_xml(client, post_chunk_url(first))
+
+    last.is_published = False
+    last.save()
+    with django_assert_num_queries(0):
+        get_xml(client, post_chunk_url(first))
+    content = get_xml(client, post_chunk_url(last))
+    assert f"/posts/{last.id}/<" not in content, (
+        "Убедитесь, что изменение публикации обновляет её часть карты сайта."
+    )
+
+
+def test_profile_and_category_sitemaps(client, public_posts, mixer):
+    post = public_posts[0]
+    idle = mixer.blend("auth.User")
+    content = get_xml(client, "/sitemap-profiles-0.xml")
+    assert f"/profile/{post.author.username}/<" in content
+    assert f"/profile/{idle.username}/<" not in content, (
+        "Убедитесь, что в карте сайта только авторы публикаций."
+    )
+    hidden = mixer.blend("blog.Category", is_published=False)
+    content = get_xml(client, "/sitemap-categories.xml")
+    assert f"/category/{post.category.slug}/<" in content
+    assert f"/category/{hidden.slug}/<" not in content